@@ -5,11 +5,24 @@ from dotenv import load_dotenv
 from flask_jwt_extended import JWTManager
 from datetime import timedelta
 from flask_cors import CORS
+from sqlalchemy.engine import make_url
+from app.utils.cache import DEFAULT_SHARED_PATH, Cache
+from app.utils.hashing import DEFAULT_ROUNDS, password_hasher
+from app.utils.query_budget import parse_budgets
+from app.utils.serializers import init_json
 import os
 
 db = SQLAlchemy()
 migrate = Migrate()
 jwt = JWTManager()
+cache = Cache()
+
+def _uses_queue_pool(uri):
+    """False for in-memory SQLite, which gets a single-connection pool that rejects the sizing options"""
+    url = make_url(uri)
+    if url.get_backend_name() != 'sqlite':
+        return True
+    return url.database not in (None, '', ':memory:') and url.query.get('mode') != 'memory'
 
 def create_app():
     app = Flask(__name__)
@@ -32,9 +45,86 @@ def create_app():
     )
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+    # Connection pool of each worker process; size it to at least the worker's thread count
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800))
+    }
+    if _uses_queue_pool(app.config['SQLALCHEMY_DATABASE_URI']):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'].update({
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30))
+        })
+
+    # SQLite profile applied to every connection: WAL lets readers run alongside the one writer,
+    # synchronous=NORMAL is durable in WAL mode, cache_size is in KiB when negative
+    app.config['SQLITE_JOURNAL_MODE'] = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    app.config['SQLITE_SYNCHRONOUS'] = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    app.config['SQLITE_CACHE_SIZE'] = int(os.getenv('SQLITE_CACHE_SIZE', -65536))
+    app.config['SQLITE_MMAP_SIZE'] = int(os.getenv('SQLITE_MMAP_SIZE', 268435456))
+    app.config['SQLITE_BUSY_TIMEOUT'] = int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000))
+    app.config['SQLITE_FOREIGN_KEYS'] = os.getenv('SQLITE_FOREIGN_KEYS', 'true').lower() == 'true'
+    # Start transactions of writing requests with BEGIN IMMEDIATE
+    app.config['SQLITE_IMMEDIATE_WRITES'] = os.getenv('SQLITE_IMMEDIATE_WRITES', 'true').lower() == 'true'
+
+    # Load the destination and avenue snapshot when the app starts rather than on first use
+    app.config['TIMETABLE_PRELOAD'] = os.getenv('TIMETABLE_PRELOAD', 'true').lower() == 'true'
+
+    # Seconds between checks for cache invalidations published by other workers
+    app.config['INVALIDATION_POLL_INTERVAL'] = float(os.getenv('INVALIDATION_POLL_INTERVAL', 1))
+
+    # Cache backend: 'memory' (per worker), 'shared' (mmapped file, per host) or 'redis'
+    app.config['CACHE_BACKEND'] = os.getenv('CACHE_BACKEND', 'memory')
+    app.config['CACHE_KEY_PREFIX'] = os.getenv('CACHE_KEY_PREFIX', 'horizon:')
+    app.config['CACHE_DEFAULT_TTL'] = float(os.getenv('CACHE_DEFAULT_TTL', 300))
+    app.config['CACHE_MAX_ENTRIES'] = int(os.getenv('CACHE_MAX_ENTRIES', 4096))
+    app.config['CACHE_SHARED_PATH'] = os.getenv('CACHE_SHARED_PATH', DEFAULT_SHARED_PATH)
+    # Shared cache table: slots x slot size bytes; values larger than a slot are not cached
+    app.config['CACHE_SHARED_SLOTS'] = int(os.getenv('CACHE_SHARED_SLOTS', 1024))
+    app.config['CACHE_SHARED_SLOT_SIZE'] = int(os.getenv('CACHE_SHARED_SLOT_SIZE', 65536))
+    app.config['CACHE_REDIS_URL'] = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    app.config['CACHE_REDIS_TIMEOUT'] = float(os.getenv('CACHE_REDIS_TIMEOUT', 1))
+
+    # Seconds to reuse availability search results (0 only coalesces concurrent identical searches)
+    app.config['AVAILABILITY_CACHE_TTL'] = float(os.getenv('AVAILABILITY_CACHE_TTL', 0))
+
+    # Add a Server-Timing header with SQL and total time to every response
+    app.config['METRICS_SERVER_TIMING'] = os.getenv('METRICS_SERVER_TIMING', 'false').lower() == 'true'
+
+    # Query budgets: 'raise', 'log' or 'off'; unset means raise under TESTING, log under DEBUG
+    app.config['QUERY_BUDGET_MODE'] = os.getenv('QUERY_BUDGET_MODE')
+    app.config['QUERY_BUDGET_DEFAULT'] = int(os.getenv('QUERY_BUDGET_DEFAULT', 20))
+    app.config['QUERY_BUDGETS'] = parse_budgets(os.getenv('QUERY_BUDGETS'))
+    app.config['QUERY_REPEAT_LIMIT'] = int(os.getenv('QUERY_REPEAT_LIMIT', 5))
+
+    # JSON encoding backend: Flask's 'default', or 'orjson' (when installed), which writes
+    # non-ASCII text as raw UTF-8 instead of \uXXXX escapes
+    app.config['JSON_BACKEND'] = os.getenv('JSON_BACKEND', 'default')
+
+    # Password hashing: pbkdf2 rounds and the process pool that runs them
+    app.config['PASSWORD_HASH_ROUNDS'] = int(os.getenv('PASSWORD_HASH_ROUNDS', DEFAULT_ROUNDS))
+    app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    app.config['PASSWORD_HASH_MAX_QUEUE'] = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', app.config['PASSWORD_HASH_WORKERS'] * 4))
+    app.config['PASSWORD_HASH_TIMEOUT'] = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    password_hasher.init_app(app)
+    init_json(app)
+
+    from app.services.invalidation_service import bus
+    bus.init_app(app)
+
+    from app.utils.database import configure_sqlite
+    from app.utils.metrics import metrics
+    from app.utils.query_budget import query_budget
+    with app.app_context():
+        configure_sqlite(db.engine, app.config)
+        metrics.init_app(app, db.engine)
+        query_budget.init_app(app, db.engine)
 
     # JWT Configuration
     app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', '70d01a72ef4a83066f1a2d5c7723db3e69bba9b527ee87148cccb8ff4a4993b1')
@@ -57,6 +147,7 @@ def create_app():
     from app.routes.bookings import bookings_bp
     from app.routes.transactions import transactions_bp
     from app.routes.stats import stats_bp
+    from app.routes.metrics import metrics_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
@@ -69,5 +160,19 @@ def create_app():
     app.register_blueprint(bookings_bp, url_prefix='/api/bookings')
     app.register_blueprint(transactions_bp, url_prefix='/api/transactions')
     app.register_blueprint(stats_bp, url_prefix='/api/stats')
+    app.register_blueprint(metrics_bp, url_prefix='/api/metrics')
+
+    # Register CLI commands
+    from app.cli import seed_cli, stats_cli
+
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(seed_cli)
+
+    # Serve the timetable from memory from the first request on
+    if app.config['TIMETABLE_PRELOAD']:
+        from app.services.timetable_service import timetable
+
+        with app.app_context():
+            timetable.preload()
 
     return app
\ No newline at end of file
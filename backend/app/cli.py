@@ -0,0 +1,38 @@
+import click
+from flask.cli import AppGroup
+
+stats_cli = AppGroup('stats', help='Maintain the analytics rollup tables.')
+
+@stats_cli.command('rebuild')
+def rebuild_stats_command():
+    """Rebuild daily_booking_stats and daily_revenue_stats from history."""
+    from app.services.rollup_service import rebuild_rollups
+
+    booking_rows, revenue_rows = rebuild_rollups()
+    click.echo(f'Rebuilt {booking_rows} daily booking rows and {revenue_rows} daily revenue rows')
+
+seed_cli = AppGroup('seed', help='Generate synthetic data for benchmarks and load tests.')
+
+@seed_cli.command('generate')
+@click.option('--destinations', default=0, show_default=True, help='Destinations to add.')
+@click.option('--avenues', default=0, show_default=True, help='Avenues to add between the destinations.')
+@click.option('--users', default=0, show_default=True, help='Member users to add.')
+@click.option('--bookings', default=0, show_default=True, help='Bookings to add, each with its transactions.')
+@click.option('--password', default='password123', show_default=True, help='Password of every seeded user.')
+@click.option('--seed', type=int, default=None, help='Random seed, for a reproducible data set.')
+@click.option('--batch-size', default=10000, show_default=True, help='Rows per bulk insert.')
+@click.option('--days', default=365, show_default=True, help='How far back bookings go.')
+def generate_seed_command(destinations, avenues, users, bookings, password, seed, batch_size, days):
+    """Append synthetic destinations, avenues, users and bookings, e.g.
+
+    flask seed generate --destinations 2000 --avenues 50000 --users 200000 --bookings 5000000
+    """
+    from app.services.seed_service import seed as seed_data
+
+    try:
+        seed_data(
+            destinations=destinations, avenues=avenues, users=users, bookings=bookings, password=password,
+            seed=seed, batch_size=batch_size, days=days, progress=click.echo
+        )
+    except ValueError as e:
+        raise click.ClickException(str(e))
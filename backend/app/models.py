@@ -1,6 +1,6 @@
 from app import db
 from datetime import datetime
-from passlib.hash import pbkdf2_sha256
+from app.utils.hashing import password_hasher
 from enum import Enum
 from datetime import datetime, timezone
 from sqlalchemy import ForeignKey
@@ -53,6 +53,9 @@ class TransactionType(Enum):
 
 class User(db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -62,10 +65,13 @@ class User(db.Model):
     created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
     def set_password(self, password):
-        self.password_hash = pbkdf2_sha256.hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return pbkdf2_sha256.verify(password, self.password_hash)
+        return password_hasher.verify(password, self.password_hash)
+
+    def needs_rehash(self):
+        return password_hasher.needs_update(self.password_hash)
 
     def is_admin(self):
         return self.role == UserRole.ADMIN
@@ -114,6 +120,11 @@ class Destination(db.Model):
     
 class Avenue(db.Model):
     __tablename__ = 'avenues'
+    __table_args__ = (
+        db.Index('ix_avenues_leave_destination_status', 'leave_destination_id', 'status', 'arrive_destination_id'),
+        db.Index('ix_avenues_arrive_destination', 'arrive_destination_id'),
+        db.Index('ix_avenues_leave_time_id', 'leave_time', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     leave_destination_id = db.Column(db.Integer, ForeignKey('destinations.id'), nullable=False)
@@ -135,6 +146,9 @@ class Avenue(db.Model):
     
 class Contact(db.Model):
     __tablename__ = 'contacts'
+    __table_args__ = (
+        db.Index('ix_contacts_created_at_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -162,6 +176,11 @@ class ChangeLog(db.Model):
     
 class Transaction(db.Model):
     __tablename__ = 'transactions'
+    __table_args__ = (
+        db.Index('ix_transactions_status_created_at', 'status', 'created_at'),
+        db.Index('ix_transactions_created_at_id', 'created_at', 'id'),
+        db.Index('ix_transactions_booking_id', 'booking_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     identifier = db.Column(db.String(32), unique=True, nullable=False)
@@ -180,6 +199,12 @@ class Transaction(db.Model):
     
 class Booking(db.Model):
     __tablename__ = 'bookings'
+    __table_args__ = (
+        db.Index('ix_bookings_avenue_date_status_mode', 'avenue_id', 'date', 'status', 'mode'),
+        db.Index('ix_bookings_user_date', 'user_id', 'date'),
+        db.Index('ix_bookings_status_created_at', 'status', 'created_at'),
+        db.Index('ix_bookings_created_at_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -212,3 +237,71 @@ class Booking(db.Model):
 
     def __repr__(self):
         return f'<Booking {self.identifier} - {self.status.value}>'
+
+class SeatInventory(db.Model):
+    __tablename__ = 'seat_inventory'
+
+    avenue_id = db.Column(db.Integer, ForeignKey('avenues.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    mode = db.Column(db.Enum(TravelMode), primary_key=True)
+    type = db.Column(db.Enum(SeatClass), primary_key=True)
+
+    capacity = db.Column(db.Integer, nullable=False)
+    booked = db.Column(db.Integer, default=0, nullable=False)
+
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<SeatInventory {self.avenue_id} {self.date} {self.mode.value}/{self.type.value}>'
+
+class DailyBookingStats(db.Model):
+    __tablename__ = 'daily_booking_stats'
+
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.Enum(BookingStatus), primary_key=True)
+    mode = db.Column(db.Enum(TravelMode), primary_key=True)
+    ticket = db.Column(db.Enum(ScannedStatus), primary_key=True)
+
+    bookings = db.Column(db.Integer, default=0, nullable=False)
+    seats = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<DailyBookingStats {self.day} {self.status.value}/{self.mode.value}/{self.ticket.value}>'
+
+class DailyRevenueStats(db.Model):
+    __tablename__ = 'daily_revenue_stats'
+
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.Enum(TransactionStatus), primary_key=True)
+    type = db.Column(db.Enum(TransactionType), primary_key=True)
+
+    transactions = db.Column(db.Integer, default=0, nullable=False)
+    amount = db.Column(db.Float, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<DailyRevenueStats {self.day} {self.status.value}/{self.type.value}>'
+
+class ResourceRevision(db.Model):
+    __tablename__ = 'resource_revisions'
+
+    resource = db.Column(db.String(50), primary_key=True)
+    revision = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f'<ResourceRevision {self.resource} {self.revision}>'
+
+class CacheVersion(db.Model):
+    __tablename__ = 'cache_versions'
+    __table_args__ = (
+        db.Index('ix_cache_versions_created_at', 'created_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity = db.Column(db.String(50), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=True)
+    origin = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<CacheVersion {self.id} {self.entity}:{self.entity_id}>'
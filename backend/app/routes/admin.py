@@ -3,6 +3,9 @@ from flask_jwt_extended import jwt_required
 from app.utils.security import admin_required
 from app.services.admin_service import get_all_users, admin_update_user_password
 from app.utils.validators import validate_admin_password_update
+from app.utils.pagination import get_page_args
+from app.utils.hashing import HashingOverloaded
+from app.utils.serializers import encode_user
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 
@@ -10,16 +13,18 @@ admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
 @jwt_required()
 @admin_required()
 def list_users():
-    users = get_all_users()
+    cursor, limit, error = get_page_args(request.args)
+    if error:
+        return jsonify({'message': error}), 400
+    
+    try:
+        users, next_cursor = get_all_users(cursor=cursor, limit=limit)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
     return jsonify({
-        'users': [{
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'role': user.role.value,
-            "avatar": f"https://boring-avatars-api.vercel.app/api/avatar?size=40&variant=beam&name={user.username}",
-            "created_at": user.created_at,
-        } for user in users]
+        'next_cursor': next_cursor,
+        'users': [encode_user(user) for user in users]
     }), 200
 
 @admin_bp.route('/update-password', methods=['POST'])
@@ -40,17 +45,12 @@ def admin_password_update():
         
         return jsonify({
             'message': 'Password updated successfully',
-            'user': {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': user.role.value,
-                "avatar": f"https://boring-avatars-api.vercel.app/api/avatar?size=40&variant=beam&name={user.username}",
-                "created_at": user.created_at,
-            }
+            'user': encode_user(user)
         }), 200
         
     except ValueError as e:
         return jsonify({'message': str(e)}), 400
+    except HashingOverloaded as e:
+        return jsonify({'message': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'message': 'Failed to update password'}), 500
\ No newline at end of file
@@ -2,6 +2,9 @@ from flask import Blueprint, request, jsonify
 from app.services.auth_service import register_user, authenticate_user, update_user_password
 from app.utils.security import validate_password_change_data, validate_registration_data
 from app.utils.security import create_access_token_for_user, get_current_user
+from app.utils.hashing import HashingOverloaded
+from app.utils.database import read_only
+from app.utils.serializers import encode_user
 from flask_jwt_extended import jwt_required, create_refresh_token
 
 auth_bp = Blueprint('auth', __name__)
@@ -23,25 +26,25 @@ def register():
             'message': 'User registered successfully',
             'access_token': access_token,
             'refresh_token': refresh_token,
-            'user': {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': user.role.value,
-                "avatar": f"https://boring-avatars-api.vercel.app/api/avatar?size=40&variant=beam&name={user.username}",
-                "created_at": user.created_at,
-            }
+            'user': encode_user(user)
         }), 201
+    except HashingOverloaded as e:
+        return jsonify({'message': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'message': str(e)}), 400
 
 @auth_bp.route('/login', methods=['POST'])
+@read_only
 def login():
     data = request.get_json()
     if not data or 'username' not in data or 'password' not in data:
         return jsonify({'message': 'Username and password are required'}), 400
     
-    user = authenticate_user(data['username'], data['password'])
+    try:
+        user = authenticate_user(data['username'], data['password'])
+    except HashingOverloaded as e:
+        return jsonify({'message': str(e)}), 503, {'Retry-After': '1'}
+
     if not user:
         return jsonify({'message': 'Invalid credentials'}), 401
     
@@ -52,14 +55,7 @@ def login():
         'message': 'Login successful',
         'access_token': access_token,
         'refresh_token': refresh_token,
-        'user': {
-            'id': user.id,
-            'username': user.username,
-            'email': user.email,
-            'role': user.role.value,
-            "avatar": f"https://boring-avatars-api.vercel.app/api/avatar?size=40&variant=beam&name={user.username}",
-            "created_at": user.created_at,
-        }
+        'user': encode_user(user)
     }), 200
 
 @auth_bp.route('/me', methods=['GET'])
@@ -69,14 +65,7 @@ def get_current_user_info():
     if not user:
         return jsonify({'message': 'User not found'}), 404
     
-    return jsonify({
-        'id': user.id,
-        'username': user.username,
-        'email': user.email,
-        'role': user.role.value,
-        "avatar": f"https://boring-avatars-api.vercel.app/api/avatar?size=40&variant=beam&name={user.username}",
-        "created_at": user.created_at,
-    }), 200
+    return jsonify(encode_user(user)), 200
 
 @auth_bp.route('/update-password', methods=['POST'])
 @jwt_required()
@@ -106,17 +95,12 @@ def update_password():
             'message': 'Password updated successfully',
             'access_token': new_token,
             'refresh_token': refresh_token,
-            'user': {
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'role': user.role.value,
-                "avatar": f"https://boring-avatars-api.vercel.app/api/avatar?size=40&variant=beam&name={user.username}",
-                "created_at": user.created_at,
-            }
+            'user': encode_user(user)
         }), 200
         
     except ValueError as e:
         return jsonify({'message': str(e)}), 400
+    except HashingOverloaded as e:
+        return jsonify({'message': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'message': 'Failed to update password'}), 500
\ No newline at end of file
@@ -2,61 +2,60 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.utils.security import admin_required
 from app.services.avenue_service import *
+from app.services.route_service import search_connections
 from app.utils.validators import validate_avenue_data
+from app.utils.pagination import get_page_args
+from app.utils.serializers import encode_available_avenue, encode_avenue, encode_avenue_listing
+from app.utils.serializers import get_format_arg, normalize_avenues
+from app.utils.etag import conditional
+from app.utils.database import read_only
+from app.services.revision_service import AVENUES, DESTINATIONS
 
 avenues_bp = Blueprint('avenues', __name__)
 
 @avenues_bp.route('/all', methods=['GET'])
+@conditional(AVENUES, DESTINATIONS, cache_control='public, max-age=30, stale-while-revalidate=120')
 def list_avenues():
     leave_id = request.args.get('leave_id')
     arrive_id = request.args.get('arrive_id')
     
-    avenues = get_avenues_by_destinations(leave_id, arrive_id) if any([leave_id, arrive_id]) else get_all_avenues()
+    cursor, limit, error = get_page_args(request.args)
+    if not error:
+        normalized, error = get_format_arg(request.args)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
     
+    try:
+        if any([leave_id, arrive_id]):
+            avenues, next_cursor = get_avenues_by_destinations(leave_id, arrive_id, cursor=cursor, limit=limit)
+        else:
+            avenues, next_cursor = get_all_avenues(cursor=cursor, limit=limit)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    if normalized:
+        data, included = normalize_avenues(avenues)
+        return jsonify({
+            'success': True,
+            'next_cursor': next_cursor,
+            'data': data,
+            'included': included
+        })
+
     return jsonify({
         'success': True,
-        'data': [{
-            'id': avenue.id,
-            'leave_destination': {
-                'id': avenue.leave_destination_id,
-                'name': avenue.leave_destination.name,
-                'modes': {
-                    'air': avenue.leave_destination.air,
-                    'coach': avenue.leave_destination.coach,
-                    'train': avenue.leave_destination.train
-                },
-                'status': avenue.leave_destination.status.value,
-                'created_at': avenue.leave_destination.created_at.isoformat()
-            },
-            'arrive_destination': {
-                'id': avenue.arrive_destination_id,
-                'name': avenue.arrive_destination.name,
-                'modes': {
-                    'air': avenue.arrive_destination.air,
-                    'coach': avenue.arrive_destination.coach,
-                    'train': avenue.arrive_destination.train
-                },
-                'status': avenue.arrive_destination.status.value,
-                'created_at': avenue.arrive_destination.created_at.isoformat()
-            },
-            'leave_time': avenue.leave_time.isoformat(),
-            'arrive_time': avenue.arrive_time.isoformat(),
-            'price': {
-                'air': 0 if not avenue.leave_destination.air or not avenue.arrive_destination.air else avenue.price,
-                'coach': 0 if not avenue.leave_destination.coach or not avenue.arrive_destination.coach else avenue.price / (1/3),
-                'train': 0 if not avenue.leave_destination.train or not avenue.arrive_destination.train else avenue.price * 3
-            },
-            'seats': {
-                'air': 140,
-                'coach': 50,
-                'train': 240
-            },
-            'status': avenue.status.value,
-            'created_at': avenue.created_at.isoformat()
-        } for avenue in avenues]
+        'next_cursor': next_cursor,
+        'data': [encode_avenue_listing(avenue) for avenue in avenues]
     })
 
 @avenues_bp.route('/detail/<int:avenue_id>', methods=['GET'])
+@conditional(AVENUES, DESTINATIONS, cache_control='public, max-age=30, stale-while-revalidate=120')
 def get_avenue_details(avenue_id):
     avenue, error = get_avenue(avenue_id)
     if error:
@@ -67,40 +66,7 @@ def get_avenue_details(avenue_id):
     
     return jsonify({
         'success': True,
-        'data': {
-            'id': avenue.id,
-            'leave_destination': {
-                'id': avenue.leave_destination_id,
-                'name': avenue.leave_destination.name,
-                'modes': {
-                    'air': avenue.leave_destination.air,
-                    'coach': avenue.leave_destination.coach,
-                    'train': avenue.leave_destination.train
-                },
-                'status': avenue.leave_destination.status.value,
-                'created_at': avenue.leave_destination.created_at.isoformat()
-            },
-            'arrive_destination': {
-                'id': avenue.arrive_destination_id,
-                'name': avenue.arrive_destination.name,
-                'modes': {
-                    'air': avenue.arrive_destination.air,
-                    'coach': avenue.arrive_destination.coach,
-                    'train': avenue.arrive_destination.train
-                },
-                'status': avenue.arrive_destination.status.value,
-                'created_at': avenue.arrive_destination.created_at.isoformat()
-            },
-            'leave_time': avenue.leave_time.isoformat(),
-            'arrive_time': avenue.arrive_time.isoformat(),
-            'price': {
-                'air': 0 if not avenue.leave_destination.air or not avenue.arrive_destination.air else avenue.price,
-                'coach': 0 if not avenue.leave_destination.coach or not avenue.arrive_destination.coach else avenue.price / (1/3),
-                'train': 0 if not avenue.leave_destination.train or not avenue.arrive_destination.train else avenue.price * 3
-            },
-            'status': avenue.status.value,
-            'created_at': avenue.created_at.isoformat()
-        }
+        'data': encode_avenue(avenue)
     })
 
 @avenues_bp.route('/create', methods=['POST'])
@@ -187,6 +153,7 @@ def delete_avenue_endpoint(avenue_id):
 
 
 @avenues_bp.route('/available', methods=['POST'])
+@read_only
 def get_available_avenues_endpoint():
     data = request.get_json()
 
@@ -227,37 +194,55 @@ def get_available_avenues_endpoint():
     
     return jsonify({
         'success': True,
-        'data': [{
-            'id': result['avenue'].id,
-            'leave_destination': {
-                'id': result['avenue'].leave_destination.id,
-                'name': result['avenue'].leave_destination.name,
-                'modes': {
-                    'air': result['avenue'].leave_destination.air,
-                    'coach': result['avenue'].leave_destination.coach,
-                    'train': result['avenue'].leave_destination.train
-                },
-                'status': result['avenue'].leave_destination.status.value,
-                'created_at': result['avenue'].leave_destination.created_at.isoformat()
-            },
-            'arrive_destination': {
-                'id': result['avenue'].arrive_destination.id,
-                'name': result['avenue'].arrive_destination.name,
-                'modes': {
-                    'air': result['avenue'].arrive_destination.air,
-                    'coach': result['avenue'].arrive_destination.coach,
-                    'train': result['avenue'].arrive_destination.train
-                },
-                'status': result['avenue'].arrive_destination.status.value,
-                'created_at': result['avenue'].arrive_destination.created_at.isoformat()
-            },
-            'leave_time': result['avenue'].leave_time.isoformat(),
-            'arrive_time': result['avenue'].arrive_time.isoformat(),
-            'travel_mode': result['mode'].value,
-            'prices': result['prices'],
-            'seat_availability': result['seat_availability'],
-            'discount': result['discount'],
-            'max_seats': result['max_seats'],
-            'booked_seats': result['booked_seats']
-        } for result in results]
-    })
\ No newline at end of file
+        'data': [encode_available_avenue(result) for result in results]
+    })
+
+@avenues_bp.route('/connections', methods=['POST'])
+@read_only
+def search_connections_endpoint():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'Request body must be a JSON object'
+        }), 400
+
+    if not data.get('date'):
+        return jsonify({
+            'success': False,
+            'error': 'Journey date is required'
+        }), 400
+
+    results, error = search_connections(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+
+    return jsonify({
+        'success': True,
+        'data': results
+    })
+
+@avenues_bp.route('/calendar', methods=['POST'])
+@read_only
+def get_fare_calendar_endpoint():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({
+            'success': False,
+            'error': 'Request body must be a JSON object'
+        }), 400
+
+    calendar, error = get_fare_calendar(data)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+
+    return jsonify({
+        'success': True,
+        'data': calendar
+    })
@@ -2,8 +2,10 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.services.booking_service import *
 from app.utils.validators import validate_booking_data
+from app.utils.pagination import get_page_args
+from app.utils.serializers import BOOKING, BOOKING_RELATIONS, booking_encoder, encode_created_booking
+from app.utils.serializers import get_fieldset_args, get_format_arg, normalize_bookings
 from app.utils.security import admin_required, get_current_user_id
-from app.services.transaction_service import create_transaction
 
 bookings_bp = Blueprint('bookings', __name__)
 
@@ -28,15 +30,21 @@ def create_booking_endpoint():
             'error': error
         }), 400
     
-    transactionData = {
-        'booking_id': booking.id,
-        'amount': booking.price,
-        'payment_method': data['payment']
-    }
-
-    transaction, transactionerror = create_transaction(transactionData)
+    transaction = booking.transactions[0]
     
-    if transactionerror:
+    return jsonify({
+        'success': True,
+        'message': 'Booking created successfully with transaction ' + transaction.identifier,
+        'data': encode_created_booking(booking)
+    }), 201
+
+
+@bookings_bp.route('/cancel/<int:booking_id>', methods=['POST'])
+@jwt_required()
+@admin_required()
+def cancel_booking_endpoint(booking_id):
+    booking, error = cancel_booking(booking_id)
+    if error:
         return jsonify({
             'success': False,
             'error': error
@@ -44,54 +52,18 @@ def create_booking_endpoint():
     
     return jsonify({
         'success': True,
-        'message': 'Booking created successfully with transaction ' + transaction.identifier,
+        'message': 'Booking cancelled successfully',
         'data': {
             'id': booking.id,
-            'identifier': booking.identifier,
             'status': booking.status.value,
-            'date': booking.date.isoformat(),
-            'mode': booking.mode.value,
-            'type': booking.type.value,
-            'seat': booking.seat,
-            'price': booking.price,
-            'ticket': booking.ticket.value,
-            'created_at': booking.created_at.isoformat(),
-            'updated_at': booking.updated_at.isoformat(),
-            
-            'user': {
-                'id': booking.user.id,
-                'username': booking.user.username,
-                'email': booking.user.email,
-                'role': booking.user.role.value,
-            },
-            'avenue': {
-                'id': booking.avenue.id,
-                'from': booking.avenue.leave_destination.name,
-                'to': booking.avenue.arrive_destination.name,
-                'leave_time': booking.avenue.leave_time.isoformat(),
-                'arrive_time': booking.avenue.arrive_time.isoformat(),
-                'price': booking.avenue.price,
-            },
-            'transactions': [
-                {
-                    'id': t.id,
-                    'identifier': t.identifier,
-                    'amount': t.amount,
-                    'status': t.status.value,
-                    'payment_method': t.payment_method.value,
-                    'type': t.type.value,
-                    'created_at': t.created_at.isoformat()
-                } for t in booking.transactions
-            ]
         }
-    }), 201
-
+    })
 
-@bookings_bp.route('/cancel/<int:booking_id>', methods=['POST'])
+@bookings_bp.route('/scan/<int:booking_id>', methods=['POST'])
 @jwt_required()
 @admin_required()
-def cancel_booking_endpoint(booking_id):
-    booking, error = cancel_booking(booking_id)
+def scan_booking_endpoint(booking_id):
+    booking, error = scan_booking_ticket(booking_id)
     if error:
         return jsonify({
             'success': False,
@@ -100,10 +72,10 @@ def cancel_booking_endpoint(booking_id):
     
     return jsonify({
         'success': True,
-        'message': 'Booking cancelled successfully',
+        'message': 'Ticket scanned successfully',
         'data': {
             'id': booking.id,
-            'status': booking.status.value,
+            'ticket': booking.ticket.value,
         }
     })
 
@@ -143,71 +115,30 @@ def cancel_user_booking_endpoint(booking_id):
 @bookings_bp.route('/user', methods=['GET'])
 @jwt_required()
 def get_user_bookings_endpoint():
+    fields, include, error = get_fieldset_args(request.args, BOOKING, BOOKING_RELATIONS)
+    if not error:
+        normalized, error = get_format_arg(request.args)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+
     user_id = get_current_user_id()
-    bookings = get_user_bookings(user_id)    
+    bookings = get_user_bookings(user_id, fields=fields, include=include)
+
+    if normalized:
+        data, included = normalize_bookings(bookings, fields, include)
+        return jsonify({
+            'success': True,
+            'data': data,
+            'included': included
+        })
+
+    encode_booking = booking_encoder(fields, include)
     return jsonify({
         'success': True,
-        'data': [ 
-            {
-                'id': b.id,
-                'identifier': b.identifier,
-                'status': b.status.value,
-                'date': b.date.isoformat(),
-                'mode': b.mode.value,
-                'type': b.type.value,
-                'seat': b.seat,
-                'price': b.price,
-                'ticket': b.ticket.value,
-                'created_at': b.created_at.isoformat(),
-                'updated_at': b.updated_at.isoformat(),
-
-                'user': {
-                    'id': b.user.id,
-                    'username': b.user.username,
-                    'email': b.user.email,
-                    'role': b.user.role.value,
-                },
-                'avenue': {
-                    'id': b.avenue.id,
-                    'leave_time': b.avenue.leave_time.isoformat(),
-                    'arrive_time': b.avenue.arrive_time.isoformat(),
-                    'price': b.avenue.price,
-                    'leave_destination': {
-                        'id': b.avenue.leave_destination.id,
-                        'name': b.avenue.leave_destination.name,
-                        'modes': {
-                            'air': b.avenue.leave_destination.air,
-                            'coach': b.avenue.leave_destination.coach,
-                            'train': b.avenue.leave_destination.train
-                        },
-                        'status': b.avenue.leave_destination.status.value,
-                        'created_at': b.avenue.leave_destination.created_at.isoformat()
-                    },
-                    'arrive_destination': {
-                        'id': b.avenue.arrive_destination.id,
-                        'name': b.avenue.arrive_destination.name,
-                        'modes': {
-                            'air': b.avenue.arrive_destination.air,
-                            'coach': b.avenue.arrive_destination.coach,
-                            'train': b.avenue.arrive_destination.train
-                        },
-                        'status': b.avenue.arrive_destination.status.value,
-                        'created_at': b.avenue.arrive_destination.created_at.isoformat()
-                    }
-                },
-                'transactions': [
-                    {
-                        'id': t.id,
-                        'identifier': t.identifier,
-                        'amount': t.amount,
-                        'status': t.status.value,
-                        'payment_method': t.payment_method.value,
-                        'type': t.type.value,
-                        'created_at': t.created_at.isoformat()
-                    } for t in b.transactions
-                ]
-            } for b in bookings
-        ]
+        'data': [encode_booking(b) for b in bookings]
     })
 
 
@@ -218,69 +149,39 @@ def get_all_bookings_admin():
     status = request.args.get('status')
     user_id = request.args.get('user_id')
     
-    bookings = get_all_bookings(status=status, user_id=user_id)
+    cursor, limit, error = get_page_args(request.args)
+    if not error:
+        fields, include, error = get_fieldset_args(request.args, BOOKING, BOOKING_RELATIONS)
+    if not error:
+        normalized, error = get_format_arg(request.args)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
     
+    try:
+        bookings, next_cursor = get_all_bookings(
+            status=status, user_id=user_id, cursor=cursor, limit=limit, fields=fields, include=include
+        )
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    if normalized:
+        data, included = normalize_bookings(bookings, fields, include)
+        return jsonify({
+            'success': True,
+            'next_cursor': next_cursor,
+            'data': data,
+            'included': included
+        })
+
+    encode_booking = booking_encoder(fields, include)
     return jsonify({
         'success': True,
-        'data': [ 
-            {
-                'id': b.id,
-                'identifier': b.identifier,
-                'status': b.status.value,
-                'date': b.date.isoformat(),
-                'mode': b.mode.value,
-                'type': b.type.value,
-                'seat': b.seat,
-                'price': b.price,
-                'ticket': b.ticket.value,
-                'created_at': b.created_at.isoformat(),
-                'updated_at': b.updated_at.isoformat(),
-
-                'user': {
-                    'id': b.user.id,
-                    'username': b.user.username,
-                    'email': b.user.email,
-                    'role': b.user.role.value,
-                },
-                'avenue': {
-                    'id': b.avenue.id,
-                    'leave_time': b.avenue.leave_time.isoformat(),
-                    'arrive_time': b.avenue.arrive_time.isoformat(),
-                    'price': b.avenue.price,
-                    'leave_destination': {
-                        'id': b.avenue.leave_destination.id,
-                        'name': b.avenue.leave_destination.name,
-                        'modes': {
-                            'air': b.avenue.leave_destination.air,
-                            'coach': b.avenue.leave_destination.coach,
-                            'train': b.avenue.leave_destination.train
-                        },
-                        'status': b.avenue.leave_destination.status.value,
-                        'created_at': b.avenue.leave_destination.created_at.isoformat()
-                    },
-                    'arrive_destination': {
-                        'id': b.avenue.arrive_destination.id,
-                        'name': b.avenue.arrive_destination.name,
-                        'modes': {
-                            'air': b.avenue.arrive_destination.air,
-                            'coach': b.avenue.arrive_destination.coach,
-                            'train': b.avenue.arrive_destination.train
-                        },
-                        'status': b.avenue.arrive_destination.status.value,
-                        'created_at': b.avenue.arrive_destination.created_at.isoformat()
-                    }
-                },
-                'transactions': [
-                    {
-                        'id': t.id,
-                        'identifier': t.identifier,
-                        'amount': t.amount,
-                        'status': t.status.value,
-                        'payment_method': t.payment_method.value,
-                        'type': t.type.value,
-                        'created_at': t.created_at.isoformat()
-                    } for t in b.transactions
-                ]
-            } for b in bookings
-        ]
+        'next_cursor': next_cursor,
+        'data': [encode_booking(b) for b in bookings]
     })
\ No newline at end of file
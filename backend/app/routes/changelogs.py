@@ -3,10 +3,13 @@ from flask_jwt_extended import jwt_required
 from app.utils.security import admin_required
 from app.services.changelog_service import *
 from app.utils.validators import validate_changelog_data
+from app.utils.etag import conditional
+from app.services.revision_service import CHANGELOGS
 
 changelogs_bp = Blueprint('changelogs', __name__)
 
 @changelogs_bp.route('/all', methods=['GET'])
+@conditional(CHANGELOGS, cache_control='public, max-age=300, stale-while-revalidate=3600')
 def list_changelogs():
     status = request.args.get('status')
     changelogs = get_all_changelogs(status)
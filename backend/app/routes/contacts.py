@@ -3,6 +3,7 @@ from flask_jwt_extended import jwt_required
 from app.utils.security import admin_required
 from app.services.contact_service import *
 from app.utils.validators import validate_contact_data
+from app.utils.pagination import get_page_args
 
 contacts_bp = Blueprint('contacts', __name__)
 
@@ -11,10 +12,24 @@ contacts_bp = Blueprint('contacts', __name__)
 @admin_required()
 def list_contacts():
     status = request.args.get('status')
-    contacts = get_all_contacts(status)
+    cursor, limit, error = get_page_args(request.args)
+    if error:
+        return jsonify({
+            'success': False,
+            'error': error
+        }), 400
+    
+    try:
+        contacts, next_cursor = get_all_contacts(status, cursor=cursor, limit=limit)
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     
     return jsonify({
         'success': True,
+        'next_cursor': next_cursor,
         'data': [{
             'id': contact.id,
             'name': contact.name,
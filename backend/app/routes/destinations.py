@@ -3,10 +3,14 @@ from flask_jwt_extended import jwt_required
 from app.utils.security import admin_required
 from app.services.destination_service import *
 from app.utils.validators import validate_destination_data
+from app.utils.serializers import encode_destination
+from app.utils.etag import conditional
+from app.services.revision_service import DESTINATIONS
 
 destinations_bp = Blueprint('destinations', __name__)
 
 @destinations_bp.route('/all', methods=['GET'])
+@conditional(DESTINATIONS, cache_control='public, max-age=60, stale-while-revalidate=300')
 def list_destinations():
     active_only = request.args.get('active', 'true').lower() == 'true'
     travel_mode = request.args.get('travel_mode')
@@ -18,17 +22,7 @@ def list_destinations():
     
     return jsonify({
         'success': True,
-        'data': [{
-            'id': dest.id,
-            'name': dest.name,
-            'modes': {
-                'air': dest.air,
-                'coach': dest.coach,
-                'train': dest.train
-            },
-            'status': dest.status.value,
-            'created_at': dest.created_at.isoformat()
-        } for dest in destinations]
+        'data': [encode_destination(dest) for dest in destinations]
     })
 
 @destinations_bp.route('/detail/<int:destination_id>', methods=['GET'])
@@ -42,17 +36,7 @@ def get_destination_details(destination_id):
     
     return jsonify({
         'success': True,
-        'data': {
-            'id': destination.id,
-            'name': destination.name,
-            'modes': {
-                'air': destination.air,
-                'coach': destination.coach,
-                'train': destination.train
-            },
-            'status': destination.status.value,
-            'created_at': destination.created_at.isoformat()
-        }
+        'data': encode_destination(destination)
     })
 
 @destinations_bp.route('/create', methods=['POST'])
@@ -3,10 +3,13 @@ from flask_jwt_extended import jwt_required
 from app.utils.security import admin_required
 from app.services.faq_service import *
 from app.utils.validators import validate_faq_data
+from app.utils.etag import conditional
+from app.services.revision_service import FAQS
 
 faqs_bp = Blueprint('faqs', __name__)
 
 @faqs_bp.route('/all', methods=['GET'])
+@conditional(FAQS, cache_control='public, max-age=300, stale-while-revalidate=3600')
 def get_all():
     faqs = get_all_faqs()
     return jsonify({
@@ -3,10 +3,13 @@ from flask_jwt_extended import jwt_required
 from app.utils.security import admin_required
 from app.services.legal_service import *
 from app.utils.validators import validate_legal_page_data
+from app.utils.etag import conditional
+from app.services.revision_service import LEGAL_PAGES
 
 legal_pages_bp = Blueprint('legal_pages', __name__)
 
 @legal_pages_bp.route('/pages', methods=['GET'])
+@conditional(LEGAL_PAGES, cache_control='public, max-age=3600, stale-while-revalidate=86400')
 def list_legal_pages():
     pages = get_all_legal_pages()
     return jsonify({
@@ -22,6 +25,7 @@ def list_legal_pages():
     })
 
 @legal_pages_bp.route('/page/<slug>', methods=['GET'])
+@conditional(LEGAL_PAGES, cache_control='public, max-age=3600, stale-while-revalidate=86400')
 def get_page_by_slug(slug):
     page, error = get_legal_page_by_slug(slug)
     if error:
@@ -0,0 +1,28 @@
+from flask import Blueprint, Response
+from flask_jwt_extended import jwt_required
+from app import cache
+from app.utils.security import admin_required
+from app.utils.metrics import Counter, metrics
+from app.services.avenue_service import get_availability_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+@metrics_bp.route('', methods=['GET'])
+@jwt_required()
+@admin_required()
+def get_metrics():
+    availability = get_availability_metrics()
+    searches = Counter(
+        'availability_searches_total', 'Availability searches by how they were answered', ('outcome',)
+    )
+    for outcome, key in (('cache_hit', 'cache_hits'), ('coalesced', 'coalesced'), ('computed', 'computed')):
+        searches.inc(outcome, amount=availability[key])
+
+    oversized = Counter(
+        'cache_oversized_writes_total', 'Cache writes skipped because the value was larger than a shared cache slot'
+    )
+    oversized.inc(amount=getattr(cache.backend, 'oversized_writes', 0))
+
+    return Response(metrics.render(searches, oversized), content_type=PROMETHEUS_CONTENT_TYPE)
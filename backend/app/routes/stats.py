@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 from app.utils.security import admin_required, get_current_user_id
+from app.services.avenue_service import get_availability_metrics
 from app.services.stats_service import get_admin_booking_stats, get_admin_ticket_stats, get_admin_transaction_stats, get_monthly_sales_stats, get_top_customers_stats, get_user_stats, get_admin_stats
 
 stats_bp = Blueprint('stats', __name__)
@@ -159,4 +160,14 @@ def get_top_customers_stats_endpoint():
     return jsonify({
         'success': True,
         'data': data
-    })
\ No newline at end of file
+    })
+
+@stats_bp.route('/admin/availability', methods=['GET'])
+@jwt_required()
+@admin_required()
+def get_availability_metrics_endpoint():
+    # Counters are per worker process
+    return jsonify({
+        'success': True,
+        'data': get_availability_metrics()
+    })
@@ -1,8 +1,11 @@
 from app.models import User
 from app import db
+from app.utils.security import invalidate_cached_user
+from app.services.invalidation_service import USERS, bus
+from app.utils.pagination import paginate
 
-def get_all_users():
-    return User.query.all()
+def get_all_users(cursor=None, limit=None):
+    return paginate(User.query, [User.created_at, User.id], cursor, limit, descending=False)
 
 def admin_update_user_password(user_id, new_password):
     user = User.query.get(user_id)
@@ -13,5 +16,7 @@ def admin_update_user_password(user_id, new_password):
         raise ValueError("New password must be at least 8 characters")
     
     user.set_password(new_password)
+    bus.publish(USERS, user.id)
     db.session.commit()
+    invalidate_cached_user(user.id)
     return user
\ No newline at end of file
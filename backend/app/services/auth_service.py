@@ -1,5 +1,8 @@
 from app.models import User
 from app import db
+from sqlalchemy.exc import OperationalError
+from app.utils.security import invalidate_cached_user
+from app.services.invalidation_service import USERS, bus
 
 def register_user(data):
     if User.query.filter_by(username=data['username']).first():
@@ -23,6 +26,17 @@ def register_user(data):
 def authenticate_user(username, password):
     user = User.query.filter_by(username=username).first()
     if user and user.check_password(password):
+        # Upgrade hashes made with an older rounds setting while we have the password
+        if user.needs_rehash():
+            user.set_password(password)
+            bus.publish(USERS, user.id)
+            try:
+                db.session.commit()
+            except OperationalError:
+                # Login reads without the write lock; if a writer got in first, upgrade on a later login
+                db.session.rollback()
+                return user
+            invalidate_cached_user(user.id)
         return user
     return None
 
@@ -34,6 +48,8 @@ def update_user_password(user, current_password, new_password):
         raise ValueError("New password must be at least 8 characters")
     
     user.set_password(new_password)
+    bus.publish(USERS, user.id)
     db.session.commit()
+    invalidate_cached_user(user.id)
     
     return user
\ No newline at end of file
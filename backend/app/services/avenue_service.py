@@ -1,9 +1,17 @@
-from app.models import Avenue, Booking, BookingStatus, GlobalStatus, TravelMode
+from app.models import Avenue, Booking, GlobalStatus, SeatClass, SeatInventory, TravelMode
+from app.services.inventory_service import get_booked_seats_by_date, get_class_capacity, get_inventory_for_avenues, get_mode_capacity
+from app.services.fare_service import get_advance_discount, get_advance_discounts, get_class_prices, get_mode_price, get_supported_modes
+from app.services.timetable_service import timetable
 from datetime import time
 from sqlalchemy.exc import IntegrityError
-from app import db
-from datetime import datetime
-from sqlalchemy import func
+from app.services.revision_service import AVENUES, bump_revision
+from app import cache, db
+from app.utils.pagination import paginate_sorted
+from app.utils.singleflight import SingleFlight
+from collections import Counter
+from datetime import datetime, timedelta
+from flask import current_app
+import threading
 
 def create_avenue(data):
     # Check if avenue already exists
@@ -28,7 +36,9 @@ def create_avenue(data):
         )
         
         db.session.add(avenue)
+        bump_revision(AVENUES)
         db.session.commit()
+        timetable.reload()
         return avenue, None
         
     except IntegrityError:
@@ -38,11 +48,18 @@ def create_avenue(data):
         db.session.rollback()
         return None, str(e)
 
-def get_all_avenues():
-    return Avenue.query.order_by(Avenue.leave_time).all()
+def _destination_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError("Destination IDs must be integers")
+
+def get_all_avenues(cursor=None, limit=None):
+    avenues = timetable.snapshot().avenues_by_departure
+    return paginate_sorted(avenues, [Avenue.leave_time, Avenue.id], cursor, limit)
 
 def get_avenue(avenue_id):
-    avenue = Avenue.query.get(avenue_id)
+    avenue = timetable.snapshot().avenues.get(avenue_id)
     if not avenue:
         return None, "Avenue not found"
     return avenue, None
@@ -71,7 +88,9 @@ def update_avenue(avenue_id, data):
         if 'status' in data:
             avenue.status = GlobalStatus(data['status'])
 
+        bump_revision(AVENUES, avenue.id)
         db.session.commit()
+        timetable.reload()
         return avenue, None
         
     except IntegrityError:
@@ -86,21 +105,54 @@ def delete_avenue(avenue_id):
     if not avenue:
         return None, "Avenue not found"
     
+    if Booking.query.filter_by(avenue_id=avenue_id).first():
+        return None, "Cannot delete avenue as it has existing bookings"
+
+    # Seat inventory rows with nothing booked go with the avenue
+    SeatInventory.query.filter_by(avenue_id=avenue_id).delete()
     db.session.delete(avenue)
-    db.session.commit()
+    bump_revision(AVENUES, avenue.id)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return None, "Cannot delete avenue as it is still referenced"
+    timetable.reload()
     return avenue, None
 
-def get_avenues_by_destinations(leave_id=None, arrive_id=None):
+def get_avenues_by_destinations(leave_id=None, arrive_id=None, cursor=None, limit=None):
     """Filter avenues by departure and/or arrival destinations"""
-    query = Avenue.query
+    snapshot = timetable.snapshot()
     
     if leave_id:
-        query = query.filter_by(leave_destination_id=leave_id)
-    if arrive_id:
-        query = query.filter_by(arrive_destination_id=arrive_id)
+        avenues = snapshot.avenues_by_leave.get(_destination_id(leave_id), ())
+        if arrive_id:
+            arrive_id = _destination_id(arrive_id)
+            avenues = tuple(avenue for avenue in avenues if avenue.arrive_destination_id == arrive_id)
+    else:
+        avenues = snapshot.avenues_by_arrive.get(_destination_id(arrive_id), ())
     
-    return query.order_by(Avenue.leave_time).all()
+    return paginate_sorted(avenues, [Avenue.leave_time, Avenue.id], cursor, limit)
+
 
+# Concurrent identical searches in this worker share one evaluation
+_available_flight = SingleFlight()
+_available_metrics = Counter()
+_available_metrics_lock = threading.Lock()
+
+def _count(name):
+    with _available_metrics_lock:
+        _available_metrics[name] += 1
+
+def get_availability_metrics():
+    """Search counters for this worker, with cache hit and coalesce rates"""
+    with _available_metrics_lock:
+        metrics = {name: _available_metrics[name] for name in ('searches', 'cache_hits', 'coalesced', 'computed')}
+    searches = metrics['searches'] or 1
+    metrics['hit_rate'] = metrics['cache_hits'] / searches
+    metrics['coalesce_rate'] = metrics['coalesced'] / searches
+    metrics['in_flight'] = _available_flight.in_flight()
+    return metrics
 
 def get_available_avenues(data):
     # Validate input
@@ -115,21 +167,11 @@ def get_available_avenues(data):
     if not isinstance(data.get('passenger', 0), int) or data['passenger'] <= 0:
         return None, "Passenger count must be positive integer"
     
-    # Base query
-    query = Avenue.query.filter_by(status=GlobalStatus.ACTIVE)
-    
-    # Filter by departure
-    query = query.filter(Avenue.leave_destination_id == data['from'])
-    
-    # Filter by arrival if provided
-    if data.get('to'):
-        query = query.filter(Avenue.arrive_destination_id == data['to'])
-    
-    avenues = query.all()
-    
-    results = []
-    today = datetime.now().date()
-    days_advance = (journey_date - today).days
+    try:
+        leave_id = _destination_id(data['from'])
+        arrive_id = _destination_id(data['to']) if data.get('to') else None
+    except ValueError as e:
+        return None, str(e)
     
     # Get requested mode if provided
     requested_mode = data.get('mode')
@@ -139,18 +181,56 @@ def get_available_avenues(data):
         except ValueError:
             return None, f"Invalid travel mode. Must be one of: {[m.value for m in TravelMode]}"
     
+    snapshot = timetable.snapshot()
+    today = datetime.now().date()
+    
+    # Everything the results depend on; the passenger count only gates the request
+    key = 'available:{}:{}:{}:{}:{}:{}.{}'.format(
+        leave_id, arrive_id, journey_date, requested_mode.value if requested_mode else '',
+        today, *snapshot.version
+    )
+    ttl = current_app.config.get('AVAILABILITY_CACHE_TTL', 0)
+    _count('searches')
+    
+    if ttl:
+        results = cache.get(key)
+        if results is not None:
+            _count('cache_hits')
+            return results, None
+    
+    def search():
+        results = _search_available_avenues(snapshot, leave_id, arrive_id, journey_date, requested_mode, today)
+        if ttl:
+            cache.set(key, results, ttl)
+        return results
+    
+    results, shared = _available_flight.do(key, search)
+    _count('coalesced' if shared else 'computed')
+    return results, None
+
+def _search_available_avenues(snapshot, leave_id, arrive_id, journey_date, requested_mode, today):
+    # Active departures from the timetable snapshot, filtered by arrival if provided
+    avenues = [
+        avenue for avenue in snapshot.avenues_by_leave.get(leave_id, ())
+        if avenue.status == GlobalStatus.ACTIVE
+        and (arrive_id is None or avenue.arrive_destination_id == arrive_id)
+    ]
+    
+    results = []
+    days_advance = (journey_date - today).days
+    
+    # Booked seats come from the seat inventory maintained on booking and cancel
+    inventory = get_inventory_for_avenues([avenue.id for avenue in avenues], journey_date)
+    
+    # Calculate discount based on advance booking
+    discount = get_advance_discount(days_advance)
+    
     for avenue in avenues:
         # Get travel modes supported by both destinations
         departure = avenue.leave_destination
         arrival = avenue.arrive_destination
         
-        supported_modes = []
-        if departure.air and arrival.air:
-            supported_modes.append(TravelMode.AIR)
-        if departure.coach and arrival.coach:
-            supported_modes.append(TravelMode.COACH)
-        if departure.train and arrival.train:
-            supported_modes.append(TravelMode.TRAIN)
+        supported_modes = get_supported_modes(departure, arrival)
         
         # Skip if no common modes
         if not supported_modes:
@@ -164,59 +244,26 @@ def get_available_avenues(data):
         
         # Process each supported travel mode
         for mode in supported_modes:
-            # Calculate max seats based on travel mode
-            max_seats = {
-                TravelMode.AIR: 140,
-                TravelMode.COACH: 50,
-                TravelMode.TRAIN: 240
-            }.get(mode, 140)
+            max_seats = get_mode_capacity(mode)
             
-            # Get confirmed bookings for this avenue on this date for this mode
-            booked_seats = db.session.query(
-                func.sum(Booking.seat)
-            ).filter(
-                Booking.avenue_id == avenue.id,
-                Booking.date == journey_date,
-                Booking.status == BookingStatus.CONFIRMED,
-                Booking.mode == mode
-            ).scalar() or 0
+            # Calculate available seats by class
+            seat_availability = {}
+            booked_seats = 0
+            for seat_class in SeatClass:
+                row = inventory.get((avenue.id, mode, seat_class))
+                if row:
+                    booked_seats += row.booked
+                    seat_availability[seat_class.value] = max(row.capacity - row.booked, 0)
+                else:
+                    seat_availability[seat_class.value] = get_class_capacity(mode, seat_class)
             
             available_seats = max_seats - booked_seats
             
             if available_seats <= 0:
                 continue  # Skip fully booked modes
             
-            # Calculate discount based on advance booking
-            if days_advance >= 91:
-                discount = 30
-            elif days_advance >= 80:
-                discount = 20
-            elif days_advance >= 60:
-                discount = 10
-            elif days_advance >= 45:
-                discount = 5
-            else:
-                discount = 0
-            
             # Calculate prices for each class
-            base_price = avenue.price
-            if mode == TravelMode.COACH:
-                base_price = avenue.price / 3
-            elif mode == TravelMode.TRAIN:
-                base_price = avenue.price * 3
-            
-            prices = {
-                'economy': base_price * (1 - discount/100),
-                'business': base_price * 2 * (1 - discount/100),
-                'first': base_price * 3 * (1 - discount/100)
-            }
-            
-            # Calculate available seats by class
-            seat_availability = {
-                'economy': int(available_seats * 0.6),
-                'business': int(available_seats * 0.2),
-                'first': int(available_seats * 0.2)
-            }
+            prices = get_class_prices(get_mode_price(avenue.price, mode), discount)
             
             results.append({
                 'avenue': avenue,
@@ -228,4 +275,78 @@ def get_available_avenues(data):
                 'booked_seats': booked_seats
             })
     
-    return results, None
\ No newline at end of file
+    return results
+
+def get_fare_calendar(data):
+    """Cheapest economy fare and remaining seats per day for a route"""
+    if not data.get('from') or not data.get('to'):
+        return None, "Departure and arrival destinations are required"
+    
+    today = datetime.now().date()
+    try:
+        start_date = datetime.fromisoformat(data['date']).date() if data.get('date') else today
+    except (TypeError, ValueError):
+        return None, "Invalid date format (use ISO format)"
+    
+    days = data.get('days', 30)
+    if not isinstance(days, int) or not 30 <= days <= 120:
+        return None, "Days must be an integer between 30 and 120"
+    
+    requested_mode = data.get('mode')
+    if requested_mode:
+        try:
+            requested_mode = TravelMode(requested_mode)
+        except ValueError:
+            return None, f"Invalid travel mode. Must be one of: {[m.value for m in TravelMode]}"
+    
+    try:
+        leave_id, arrive_id = _destination_id(data['from']), _destination_id(data['to'])
+    except ValueError as e:
+        return None, str(e)
+    
+    avenues = [
+        avenue for avenue in timetable.snapshot().avenues_by_leave.get(leave_id, ())
+        if avenue.status == GlobalStatus.ACTIVE and avenue.arrive_destination_id == arrive_id
+    ]
+    
+    end_date = start_date + timedelta(days=days - 1)
+    booked = get_booked_seats_by_date([avenue.id for avenue in avenues], start_date, end_date)
+    
+    # Discount tiers only depend on the day, so work them out once for the window
+    discounts = get_advance_discounts((start_date - today).days, days)
+    discount_factors = [1 - discount/100 for discount in discounts]
+    
+    # (avenue, mode, undiscounted economy fare, capacity) for every bookable departure
+    departures = []
+    for avenue in avenues:
+        modes = get_supported_modes(avenue.leave_destination, avenue.arrive_destination)
+        if requested_mode:
+            modes = [requested_mode] if requested_mode in modes else []
+        for mode in modes:
+            departures.append((avenue, mode, get_mode_price(avenue.price, mode), get_mode_capacity(mode)))
+    
+    calendar = []
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        cheapest = None
+        remaining_seats = 0
+        
+        for avenue, mode, base_price, capacity in departures:
+            remaining = capacity - booked.get((avenue.id, day, mode), 0)
+            if remaining <= 0:
+                continue
+            
+            remaining_seats += remaining
+            if cheapest is None or base_price < cheapest[2]:
+                cheapest = (avenue, mode, base_price)
+        
+        calendar.append({
+            'date': day.isoformat(),
+            'price': cheapest[2] * discount_factors[offset] if cheapest else None,
+            'discount': discounts[offset],
+            'avenue_id': cheapest[0].id if cheapest else None,
+            'travel_mode': cheapest[1].value if cheapest else None,
+            'remaining_seats': remaining_seats
+        })
+    
+    return calendar, None
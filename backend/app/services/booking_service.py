@@ -1,9 +1,14 @@
-from app.models import Booking, SeatClass, Transaction, BookingStatus, TransactionStatus, TransactionType, TravelMode
+from app.models import Avenue, Booking, PaymentMethod, ScannedStatus, SeatClass, Transaction, BookingStatus, TransactionStatus, TransactionType, TravelMode
+from app.services.inventory_service import release_seats, reserve_seats
+from app.services.rollup_service import record_booking, record_transaction
 from app import db
+from app.utils.pagination import paginate
+from sqlalchemy.orm import joinedload, load_only, selectinload
 from datetime import datetime, timezone, date, timedelta
 import secrets
 
 def create_booking(data):
+    """Reserve seats, create the booking and its payment in one transaction"""
     try:
         booking = Booking(
             identifier=f"BK-{secrets.token_hex(8)}",
@@ -17,13 +22,51 @@ def create_booking(data):
             status=BookingStatus.CONFIRMED,
         )
         
+        if not reserve_seats(booking.avenue_id, booking.date, booking.mode, booking.type, booking.seat):
+            db.session.rollback()
+            return None, "Not enough seats available for this departure"
+        
+        payment = Transaction(
+            identifier=f"TXN-{secrets.token_hex(8)}",
+            amount=booking.price,
+            payment_method=PaymentMethod(data['payment']),
+            status=TransactionStatus.SUCCESS,
+            type=TransactionType.PAYMENT,
+        )
+        booking.transactions.append(payment)
+        
         db.session.add(booking)
+        db.session.flush()
+        record_booking(booking)
+        record_transaction(payment)
         db.session.commit()
         return booking, None
     except Exception as e:
         db.session.rollback()
         return None, str(e)
 
+BOOKING_RELATIONS = ('user', 'avenue', 'transactions')
+
+def with_booking_details(query, fields=None, include=BOOKING_RELATIONS):
+    """Eager-load the requested relationships of each booking, and only the requested columns"""
+    options = []
+
+    if 'user' in include:
+        options.append(joinedload(Booking.user))
+    if 'avenue' in include:
+        avenue = joinedload(Booking.avenue)
+        options.append(avenue.joinedload(Avenue.leave_destination))
+        options.append(avenue.joinedload(Avenue.arrive_destination))
+    if 'transactions' in include:
+        options.append(selectinload(Booking.transactions))
+
+    if fields is not None:
+        # The ordering and cursor columns are always needed
+        columns = {getattr(Booking, field) for field in fields} | {Booking.id, Booking.created_at, Booking.date}
+        options.append(load_only(*columns))
+
+    return query.options(*options)
+
 def get_booking(booking_id):
     booking = Booking.query.get(booking_id)
     if not booking:
@@ -36,8 +79,18 @@ def update_booking_status(booking_id, new_status):
         return None, "Booking not found"
     
     try:
-        booking.status = BookingStatus(new_status)
+        status = BookingStatus(new_status)
+        if booking.status != BookingStatus.CONFIRMED and status == BookingStatus.CONFIRMED:
+            if not reserve_seats(booking.avenue_id, booking.date, booking.mode, booking.type, booking.seat):
+                db.session.rollback()
+                return None, "Not enough seats available for this departure"
+        elif booking.status == BookingStatus.CONFIRMED and status != BookingStatus.CONFIRMED:
+            release_seats(booking.avenue_id, booking.date, booking.mode, booking.type, booking.seat)
+
+        record_booking(booking, -1)
+        booking.status = status
         booking.updated_at = datetime.now(timezone.utc)
+        record_booking(booking)
         db.session.commit()
         return booking, None
     except Exception as e:
@@ -58,9 +111,15 @@ def cancel_booking(booking_id):
         if existing_refund:
             return None, "Refund already in progress"
 
+        # Give the seats back to the departure
+        if booking.status == BookingStatus.CONFIRMED:
+            release_seats(booking.avenue_id, booking.date, booking.mode, booking.type, booking.seat)
+
         # Update booking status
+        record_booking(booking, -1)
         booking.status = BookingStatus.CANCELLED
         booking.updated_at = datetime.now(timezone.utc)
+        record_booking(booking)
 
         # Find successful payment
         successful_payment = next(
@@ -97,22 +156,46 @@ def cancel_booking(booking_id):
                     type=TransactionType.REFUND
                 )
                 db.session.add(refund)
+                db.session.flush()
+                record_transaction(refund)
+
+        db.session.commit()
+        return booking, None
+    except Exception as e:
+        db.session.rollback()
+        return None, str(e)
 
+def scan_booking_ticket(booking_id):
+    booking, error = get_booking(booking_id)
+    if error:
+        return None, error
+    
+    if booking.status != BookingStatus.CONFIRMED:
+        return None, "Only confirmed bookings can be scanned"
+    
+    if booking.ticket == ScannedStatus.SCANNED:
+        return None, "Ticket already scanned"
+    
+    try:
+        record_booking(booking, -1)
+        booking.ticket = ScannedStatus.SCANNED
+        booking.updated_at = datetime.now(timezone.utc)
+        record_booking(booking)
         db.session.commit()
         return booking, None
     except Exception as e:
         db.session.rollback()
         return None, str(e)
 
-def get_user_bookings(user_id):
-    return Booking.query.filter_by(user_id=user_id).order_by(Booking.date.desc()).all()
+def get_user_bookings(user_id, fields=None, include=BOOKING_RELATIONS):
+    return with_booking_details(Booking.query, fields, include).filter_by(user_id=user_id).order_by(Booking.date.desc()).all()
 
-def get_all_bookings(status=None, user_id=None):
-    query = Booking.query
+def get_all_bookings(status=None, user_id=None, cursor=None, limit=None, fields=None, include=BOOKING_RELATIONS):
+    query = with_booking_details(Booking.query, fields, include)
     
     if status:
         query = query.filter_by(status=BookingStatus(status))
     if user_id:
         query = query.filter_by(user_id=user_id)
     
-    return query.order_by(Booking.created_at.desc()).all()
\ No newline at end of file
+    return paginate(query, [Booking.created_at, Booking.id], cursor, limit)
\ No newline at end of file
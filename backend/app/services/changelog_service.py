@@ -1,4 +1,5 @@
 from app.models import ChangeLog, GlobalStatus
+from app.services.revision_service import CHANGELOGS, bump_revision
 from app import db
 
 def create_changelog(data):
@@ -14,6 +15,7 @@ def create_changelog(data):
     )
     
     db.session.add(changelog)
+    bump_revision(CHANGELOGS)
     db.session.commit()
     return changelog, None
 
@@ -47,6 +49,7 @@ def update_changelog(changelog_id, data):
     if 'status' in data:
         changelog.status = GlobalStatus(data['status'])
     
+    bump_revision(CHANGELOGS, changelog.id)
     db.session.commit()
     return changelog, None
 
@@ -56,5 +59,6 @@ def delete_changelog(changelog_id):
         return None, "ChangeLog not found"
     
     db.session.delete(changelog)
+    bump_revision(CHANGELOGS, changelog.id)
     db.session.commit()
     return changelog, None
\ No newline at end of file
@@ -1,5 +1,6 @@
 from app.models import Contact, ContactStatus
 from app import db
+from app.utils.pagination import paginate
 
 def create_contact(data):
     contact = Contact(
@@ -14,11 +15,11 @@ def create_contact(data):
     db.session.commit()
     return contact, None
 
-def get_all_contacts(status=None):
+def get_all_contacts(status=None, cursor=None, limit=None):
     query = Contact.query
     if status:
         query = query.filter_by(status=ContactStatus(status))
-    return query.order_by(Contact.created_at.desc()).all()
+    return paginate(query, [Contact.created_at, Contact.id], cursor, limit)
 
 def get_contact(contact_id):
     contact = Contact.query.get(contact_id)
@@ -1,5 +1,8 @@
 from app.models import Avenue, Destination, GlobalStatus
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from app.services.timetable_service import timetable
+from app.services.revision_service import DESTINATIONS, bump_revision
 from app import db
 
 def create_destination(data):
@@ -17,14 +20,16 @@ def create_destination(data):
     )
     
     db.session.add(destination)
+    bump_revision(DESTINATIONS)
     db.session.commit()
+    timetable.reload()
     return destination, None
 
 def get_all_destinations(active_only=True):
-    query = Destination.query
+    destinations = timetable.snapshot().destinations_by_created
     if active_only:
-        query = query.filter_by(status=GlobalStatus.ACTIVE)
-    return query.order_by(Destination.created_at.desc()).all()
+        return [d for d in destinations if d.status == GlobalStatus.ACTIVE]
+    return list(destinations)
 
 def get_destination(destination_id):
     destination = Destination.query.get(destination_id)
@@ -57,7 +62,10 @@ def update_destination(destination_id, data):
     if 'status' in data:
         destination.status = GlobalStatus(data['status'])
 
+    bump_revision(DESTINATIONS, destination.id)
     db.session.commit()
+    timetable.reload()
+
     return destination, None
 
 def delete_destination(destination_id):
@@ -78,24 +86,23 @@ def delete_destination(destination_id):
     
     # If no related avenues, delete the destination
     db.session.delete(destination)
-    db.session.commit()
+    bump_revision(DESTINATIONS, destination.id)
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # An avenue created since the check above
+        db.session.rollback()
+        return None, "Cannot delete destination as it's being used in existing avenues"
+    timetable.reload()
     
     return destination, None
 
 def get_destinations_by_travel_mode(travel_mode, active_only=True):
     """Get destinations available for a specific travel mode"""
-    query = Destination.query
-    
-    if travel_mode == 'air':
-        query = query.filter_by(air=True)
-    elif travel_mode == 'coach':
-        query = query.filter_by(coach=True)
-    elif travel_mode == 'train':
-        query = query.filter_by(train=True)
-    else:
+    if travel_mode not in ('air', 'coach', 'train'):
         return []
     
-    if active_only:
-        query = query.filter_by(status=GlobalStatus.ACTIVE)
-    
-    return query.order_by(Destination.name).all()
\ No newline at end of file
+    return [
+        d for d in timetable.snapshot().destinations_by_name
+        if getattr(d, travel_mode) and (not active_only or d.status == GlobalStatus.ACTIVE)
+    ]
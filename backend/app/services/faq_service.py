@@ -1,4 +1,5 @@
 from app.models import FAQ, GlobalStatus
+from app.services.revision_service import FAQS, bump_revision
 from app import db
 
 def create_faq(data):
@@ -8,6 +9,7 @@ def create_faq(data):
         status=GlobalStatus(data.get('status', GlobalStatus.INACTIVE.value))
     )
     db.session.add(faq)
+    bump_revision(FAQS)
     db.session.commit()
     return faq, None
 
@@ -31,6 +33,7 @@ def update_faq(faq_id, data):
     if 'status' in data:
         faq.status = GlobalStatus(data['status'])
     
+    bump_revision(FAQS, faq.id)
     db.session.commit()
     return faq, None
 
@@ -40,5 +43,6 @@ def delete_faq(faq_id):
         return None, "FAQ not found"
     
     db.session.delete(faq)
+    bump_revision(FAQS, faq.id)
     db.session.commit()
     return faq, None
\ No newline at end of file
@@ -0,0 +1,47 @@
+from app.models import SeatClass, TravelMode
+
+# (minimum days booked in advance, discount percent), best discount first
+ADVANCE_DISCOUNTS = [
+    (91, 30),
+    (80, 20),
+    (60, 10),
+    (45, 5)
+]
+
+# Fare of each class as a multiple of the mode's base fare
+SEAT_CLASS_PRICE_MULTIPLIERS = {
+    SeatClass.ECONOMY: 1,
+    SeatClass.BUSINESS: 2,
+    SeatClass.FIRST: 3
+}
+
+def get_advance_discount(days_advance):
+    for min_days, discount in ADVANCE_DISCOUNTS:
+        if days_advance >= min_days:
+            return discount
+    return 0
+
+def get_advance_discounts(first_days_advance, days):
+    """Discount percent for each of `days` consecutive journey dates"""
+    return [get_advance_discount(first_days_advance + offset) for offset in range(days)]
+
+def get_mode_price(price, mode):
+    """Base fare of an avenue for a travel mode"""
+    if mode == TravelMode.COACH:
+        return price / 3
+    if mode == TravelMode.TRAIN:
+        return price * 3
+    return price
+
+def get_class_prices(base_price, discount):
+    return {
+        seat_class.value: base_price * multiplier * (1 - discount/100)
+        for seat_class, multiplier in SEAT_CLASS_PRICE_MULTIPLIERS.items()
+    }
+
+def get_supported_modes(departure, arrival):
+    """Travel modes offered by both destinations"""
+    return [
+        mode for mode in TravelMode
+        if getattr(departure, mode.value) and getattr(arrival, mode.value)
+    ]
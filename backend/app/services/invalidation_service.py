@@ -0,0 +1,147 @@
+from app.models import CacheVersion
+from app import db
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, func, insert, select, text
+import os
+import select as selectors
+import socket
+import threading
+import time
+import uuid
+
+USERS = 'users'
+
+# Event rows older than this are pruned; a worker idle for longer simply starts afresh
+EVENT_RETENTION = timedelta(hours=1)
+
+# How long a missing event id may stay unresolved (a slow or rolled-back transaction)
+GAP_TIMEOUT = 10
+
+NOTIFY_CHANNEL = 'cache_versions'
+
+class InvalidationBus:
+    """Cross-worker invalidation events, published into cache_versions and polled by every worker
+
+    Publishing adds a row in the caller's transaction, so other workers only see the
+    event once the change itself is committed. On PostgreSQL a NOTIFY wakes the
+    workers up so they poll on their next request instead of waiting for the interval.
+    """
+
+    def __init__(self):
+        self.interval = 1.0
+        self._subscribers = {}
+        self._pid = None
+        self._origin = None
+        self._floor = None
+        self._seen = set()
+        self._gaps = {}
+        self._next_poll = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.interval = app.config.get('INVALIDATION_POLL_INTERVAL', 1.0)
+        app.before_request(self._poll_if_due)
+
+    @property
+    def origin(self):
+        # Forked workers must not share the master's identity, or they would skip each other's events
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._origin = f'{socket.gethostname()}:{self._pid}:{uuid.uuid4().hex[:8]}'
+            self._floor = None
+            self._start_listener()
+        return self._origin
+
+    def subscribe(self, entity, callback):
+        """Call `callback(entity_id)` when another worker changes `entity` (entity_id None: all of them)"""
+        self._subscribers.setdefault(entity, []).append(callback)
+
+    def publish(self, entity, entity_id=None):
+        """Record a change for the other workers; caller commits"""
+        db.session.execute(insert(CacheVersion).values(
+            entity=entity,
+            entity_id=entity_id,
+            origin=self.origin,
+            created_at=datetime.now(timezone.utc)
+        ))
+        db.session.execute(delete(CacheVersion).where(
+            CacheVersion.created_at < datetime.now(timezone.utc) - EVENT_RETENTION
+        ))
+        if db.session.get_bind().dialect.name == 'postgresql':
+            db.session.execute(text(f"NOTIFY {NOTIFY_CHANNEL}"))
+
+    def poll(self):
+        """Dispatch the events committed by other workers since the last poll"""
+        origin = self.origin
+
+        # Only one thread per worker polls; the others carry on with their request
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._floor is None:
+                self._floor = db.session.execute(select(func.coalesce(func.max(CacheVersion.id), 0))).scalar()
+                return
+
+            rows = db.session.execute(
+                select(CacheVersion.id, CacheVersion.entity, CacheVersion.entity_id, CacheVersion.origin)
+                .where(CacheVersion.id > self._floor)
+                .order_by(CacheVersion.id)
+            ).all()
+
+            for row in rows:
+                if row.id in self._seen:
+                    continue
+                self._seen.add(row.id)
+                if row.origin != origin:
+                    for callback in self._subscribers.get(row.entity, ()):
+                        callback(row.entity_id)
+
+            self._advance(time.monotonic())
+        finally:
+            self._lock.release()
+
+    def _advance(self, now):
+        # Ids can commit out of order, so the floor only moves past ids seen or given up on
+        top = max(self._seen, default=self._floor)
+        for missing in range(self._floor + 1, top):
+            if missing not in self._seen:
+                self._gaps.setdefault(missing, now)
+
+        while self._floor < top:
+            candidate = self._floor + 1
+            if candidate not in self._seen and now - self._gaps.get(candidate, now) < GAP_TIMEOUT:
+                break
+            self._floor = candidate
+            self._seen.discard(candidate)
+            self._gaps.pop(candidate, None)
+
+    def _poll_if_due(self):
+        now = time.monotonic()
+        if now >= self._next_poll:
+            self._next_poll = now + self.interval
+            self.poll()
+
+    def _start_listener(self):
+        """On PostgreSQL with psycopg2, poll on the next request as soon as a NOTIFY arrives"""
+        try:
+            engine = db.engine
+        except RuntimeError:
+            return
+        if engine.dialect.name != 'postgresql' or engine.dialect.driver != 'psycopg2':
+            return
+
+        def listen():
+            connection = engine.raw_connection().driver_connection
+            connection.autocommit = True
+            connection.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+            while True:
+                if selectors.select([connection], [], [], 60) == ([], [], []):
+                    continue
+                connection.poll()
+                if connection.notifies:
+                    connection.notifies.clear()
+                    self._next_poll = 0
+
+        threading.Thread(target=listen, name='cache-invalidation-listener', daemon=True).start()
+
+bus = InvalidationBus()
@@ -0,0 +1,104 @@
+from app.models import SeatClass, SeatInventory, TravelMode
+from app import db
+from app.utils.database import ensure_row
+from datetime import datetime, timezone
+from sqlalchemy import func, update
+
+# Seats per departure for each travel mode
+MODE_MAX_SEATS = {
+    TravelMode.AIR: 140,
+    TravelMode.COACH: 50,
+    TravelMode.TRAIN: 240
+}
+
+# Share of a departure's seats sold in each class
+SEAT_CLASS_SHARES = {
+    SeatClass.ECONOMY: 0.6,
+    SeatClass.BUSINESS: 0.2,
+    SeatClass.FIRST: 0.2
+}
+
+def get_mode_capacity(mode):
+    return MODE_MAX_SEATS.get(mode, MODE_MAX_SEATS[TravelMode.AIR])
+
+def get_class_capacity(mode, seat_class):
+    return int(get_mode_capacity(mode) * SEAT_CLASS_SHARES[seat_class])
+
+def get_inventory(avenue_id, journey_date, mode, seat_class):
+    return db.session.get(SeatInventory, (avenue_id, journey_date, mode, seat_class))
+
+def get_inventory_for_avenues(avenue_ids, journey_date):
+    """Inventory rows for a set of avenues on one date, keyed by (avenue_id, mode, type)"""
+    if not avenue_ids:
+        return {}
+    
+    rows = SeatInventory.query.filter(
+        SeatInventory.avenue_id.in_(avenue_ids),
+        SeatInventory.date == journey_date
+    ).all()
+    
+    return {(row.avenue_id, row.mode, row.type): row for row in rows}
+
+def get_booked_seats_by_date(avenue_ids, start_date, end_date):
+    """Booked seats per (avenue_id, date, mode) over a date range in one query"""
+    if not avenue_ids:
+        return {}
+    
+    rows = db.session.query(
+        SeatInventory.avenue_id,
+        SeatInventory.date,
+        SeatInventory.mode,
+        func.sum(SeatInventory.booked)
+    ).filter(
+        SeatInventory.avenue_id.in_(avenue_ids),
+        SeatInventory.date.between(start_date, end_date)
+    ).group_by(
+        SeatInventory.avenue_id, SeatInventory.date, SeatInventory.mode
+    ).all()
+    
+    return {(avenue_id, day, mode): seats or 0 for avenue_id, day, mode, seats in rows}
+
+def _inventory_key(avenue_id, journey_date, mode, seat_class):
+    return (
+        SeatInventory.avenue_id == avenue_id,
+        SeatInventory.date == journey_date,
+        SeatInventory.mode == mode,
+        SeatInventory.type == seat_class
+    )
+
+def reserve_seats(avenue_id, journey_date, mode, seat_class, seats):
+    """Add seats to the inventory row if capacity allows; caller commits"""
+    ensure_row(SeatInventory, {
+        'avenue_id': avenue_id,
+        'date': journey_date,
+        'mode': mode,
+        'type': seat_class,
+        'capacity': get_class_capacity(mode, seat_class),
+        'booked': 0
+    })
+    
+    # Check and increment in one guarded UPDATE so concurrent buyers
+    # serialize on the row lock and can never oversell the departure
+    result = db.session.execute(
+        update(SeatInventory)
+        .where(
+            *_inventory_key(avenue_id, journey_date, mode, seat_class),
+            SeatInventory.booked + seats <= SeatInventory.capacity
+        )
+        .values(
+            booked=SeatInventory.booked + seats,
+            updated_at=datetime.now(timezone.utc)
+        )
+    )
+    return result.rowcount == 1
+
+def release_seats(avenue_id, journey_date, mode, seat_class, seats):
+    """Remove seats from the inventory row; caller commits"""
+    db.session.execute(
+        update(SeatInventory)
+        .where(*_inventory_key(avenue_id, journey_date, mode, seat_class))
+        .values(
+            booked=SeatInventory.booked - seats,
+            updated_at=datetime.now(timezone.utc)
+        )
+    )
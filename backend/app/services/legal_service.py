@@ -1,4 +1,5 @@
 from app.models import LegalPage, GlobalStatus
+from app.services.revision_service import LEGAL_PAGES, bump_revision
 from app import db
 
 def create_legal_page(data):
@@ -13,6 +14,7 @@ def create_legal_page(data):
         status=GlobalStatus(data.get('status', GlobalStatus.INACTIVE.value))
     )
     db.session.add(page)
+    bump_revision(LEGAL_PAGES)
     db.session.commit()
     return page, None
 
@@ -51,6 +53,7 @@ def update_legal_page(page_id, data):
     if 'status' in data:
         page.status = GlobalStatus(data['status'])
     
+    bump_revision(LEGAL_PAGES, page.id)
     db.session.commit()
     return page, None
 
@@ -60,5 +63,6 @@ def delete_legal_page(page_id):
         return None, "Legal page not found"
     
     db.session.delete(page)
+    bump_revision(LEGAL_PAGES, page.id)
     db.session.commit()
     return page, None
\ No newline at end of file
@@ -0,0 +1,26 @@
+from app.models import ResourceRevision
+from app.services.invalidation_service import bus
+from app.utils.database import increment
+from app import db
+from sqlalchemy import select
+
+DESTINATIONS = 'destinations'
+AVENUES = 'avenues'
+FAQS = 'faqs'
+LEGAL_PAGES = 'legal_pages'
+CHANGELOGS = 'changelogs'
+
+def bump_revision(resource, entity_id=None):
+    """Mark every cached representation of a resource as stale, here and in other workers; caller commits"""
+    increment(ResourceRevision, {'resource': resource}, revision=1)
+    bus.publish(resource, entity_id)
+
+def get_revisions(resources):
+    """Current revision of each resource in one lightweight query (0 if never changed)"""
+    rows = db.session.execute(
+        select(ResourceRevision.resource, ResourceRevision.revision)
+        .where(ResourceRevision.resource.in_(resources))
+    )
+    revisions = dict.fromkeys(resources, 0)
+    revisions.update(rows.all())
+    return revisions
@@ -0,0 +1,65 @@
+from app.models import Booking, DailyBookingStats, DailyRevenueStats, Transaction
+from app.utils.database import increment
+from app import db
+from sqlalchemy import func, insert, select
+
+def record_booking(booking, sign=1):
+    """Add (sign=1) or remove (sign=-1) a booking from its daily rollup row; caller commits"""
+    increment(
+        DailyBookingStats,
+        {
+            'day': booking.created_at.date(),
+            'status': booking.status,
+            'mode': booking.mode,
+            'ticket': booking.ticket
+        },
+        bookings=sign,
+        seats=sign * booking.seat,
+        revenue=sign * booking.price
+    )
+
+def record_transaction(transaction, sign=1):
+    """Add (sign=1) or remove (sign=-1) a transaction from its daily rollup row; caller commits"""
+    increment(
+        DailyRevenueStats,
+        {
+            'day': transaction.created_at.date(),
+            'status': transaction.status,
+            'type': transaction.type
+        },
+        transactions=sign,
+        amount=sign * transaction.amount
+    )
+
+def rebuild_rollups():
+    """Recompute both rollup tables from the bookings and transactions history"""
+    db.session.query(DailyBookingStats).delete()
+    db.session.query(DailyRevenueStats).delete()
+
+    booking_day = func.date(Booking.created_at)
+    db.session.execute(
+        insert(DailyBookingStats).from_select(
+            ['day', 'status', 'mode', 'ticket', 'bookings', 'seats', 'revenue'],
+            select(
+                booking_day, Booking.status, Booking.mode, Booking.ticket,
+                func.count(Booking.id), func.sum(Booking.seat), func.sum(Booking.price)
+            ).where(
+                Booking.created_at.isnot(None)
+            ).group_by(booking_day, Booking.status, Booking.mode, Booking.ticket)
+        )
+    )
+
+    transaction_day = func.date(Transaction.created_at)
+    db.session.execute(
+        insert(DailyRevenueStats).from_select(
+            ['day', 'status', 'type', 'transactions', 'amount'],
+            select(
+                transaction_day, Transaction.status, Transaction.type,
+                func.count(Transaction.id), func.sum(Transaction.amount)
+            ).group_by(transaction_day, Transaction.status, Transaction.type)
+        )
+    )
+
+    db.session.commit()
+
+    return DailyBookingStats.query.count(), DailyRevenueStats.query.count()
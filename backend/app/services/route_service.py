@@ -0,0 +1,217 @@
+from app.models import GlobalStatus, TravelMode
+from app.services.fare_service import get_mode_price, get_supported_modes
+from app.services.timetable_service import timetable
+from datetime import datetime, timedelta
+from collections import namedtuple
+
+MINUTES_PER_DAY = 24 * 60
+
+# How many days after the journey date an itinerary may run into
+SEARCH_HORIZON_DAYS = 2
+
+DEFAULT_MAX_CHANGES = 2
+DEFAULT_MIN_TRANSFER = 30
+
+# One daily departure of an avenue in a given travel mode
+Connection = namedtuple('Connection', [
+    'avenue_id', 'mode', 'leave_id', 'arrive_id', 'leave_name', 'arrive_name',
+    'leave_minute', 'duration', 'price'
+])
+
+# A reachable state during the search; parent links back through the legs
+Label = namedtuple('Label', ['arrival', 'price', 'legs', 'connection', 'departure', 'parent'])
+
+def build_connections(avenue):
+    """Daily connections of an avenue for every mode both destinations support"""
+    if avenue.status != GlobalStatus.ACTIVE:
+        return ()
+
+    departure = avenue.leave_destination
+    arrival = avenue.arrive_destination
+
+    leave_minute = avenue.leave_time.hour * 60 + avenue.leave_time.minute
+    arrive_minute = avenue.arrive_time.hour * 60 + avenue.arrive_time.minute
+    # An arrival earlier in the day than the departure lands the next day
+    duration = (arrive_minute - leave_minute) % MINUTES_PER_DAY
+
+    return tuple(
+        Connection(
+            avenue_id=avenue.id,
+            mode=mode,
+            leave_id=avenue.leave_destination_id,
+            arrive_id=avenue.arrive_destination_id,
+            leave_name=departure.name,
+            arrive_name=arrival.name,
+            leave_minute=leave_minute,
+            duration=duration,
+            price=get_mode_price(avenue.price, mode)
+        )
+        for mode in get_supported_modes(departure, arrival)
+    )
+
+class RouteIndex:
+    """Departures by origin for multi-leg searches, rebuilt whenever the timetable snapshot changes"""
+
+    def __init__(self):
+        self._built = (None, {})
+
+    def departures(self):
+        snapshot = timetable.snapshot()
+        built_from, by_origin = self._built
+        if built_from is not snapshot:
+            by_origin = self._group_by_origin(snapshot.avenues_by_departure)
+            # One assignment, so concurrent searches see either the old or the new pair
+            self._built = (snapshot, by_origin)
+        return by_origin
+
+    @staticmethod
+    def _group_by_origin(avenues):
+        by_origin = {}
+        for avenue in avenues:
+            for connection in build_connections(avenue):
+                by_origin.setdefault(connection.leave_id, []).append(connection)
+        return {
+            origin: tuple(sorted(connections, key=lambda c: c.leave_minute))
+            for origin, connections in by_origin.items()
+        }
+
+route_index = RouteIndex()
+
+def _dominated(label, bag):
+    return any(
+        other.arrival <= label.arrival and other.price <= label.price
+        for other in bag
+    )
+
+def _add_to_bag(bag, label):
+    if _dominated(label, bag):
+        return False
+    bag[:] = [
+        other for other in bag
+        if not (label.arrival <= other.arrival and label.price <= other.price)
+    ]
+    bag.append(label)
+    return True
+
+def _itinerary(label, journey_start):
+    legs = []
+    while label.connection:
+        connection = label.connection
+        legs.append({
+            'avenue_id': connection.avenue_id,
+            'travel_mode': connection.mode.value,
+            'leave_destination': {'id': connection.leave_id, 'name': connection.leave_name},
+            'arrive_destination': {'id': connection.arrive_id, 'name': connection.arrive_name},
+            'leave_at': (journey_start + timedelta(minutes=label.departure)).isoformat(),
+            'arrive_at': (journey_start + timedelta(minutes=label.arrival)).isoformat(),
+            'price': round(connection.price, 2)
+        })
+        label = label.parent
+
+    legs.reverse()
+    return {
+        'leave_at': legs[0]['leave_at'],
+        'arrive_at': legs[-1]['arrive_at'],
+        'changes': len(legs) - 1,
+        'price': round(sum(leg['price'] for leg in legs), 2),
+        'legs': legs
+    }
+
+def search_connections(data):
+    """Earliest-arrival and cheapest itineraries with up to N changes"""
+    if not data.get('from') or not data.get('to'):
+        return None, "Departure and arrival destinations are required"
+
+    try:
+        origin, target = int(data['from']), int(data['to'])
+    except (TypeError, ValueError):
+        return None, "Destination IDs must be integers"
+
+    if origin == target:
+        return None, "Arrival must be different from departure"
+
+    try:
+        journey_start = datetime.fromisoformat(data['date'])
+        journey_start = journey_start.replace(hour=0, minute=0, second=0, microsecond=0)
+    except (KeyError, TypeError, ValueError):
+        return None, "Invalid date format (use ISO format)"
+
+    try:
+        earliest = datetime.strptime(data.get('time', '00:00'), '%H:%M')
+        start_minute = earliest.hour * 60 + earliest.minute
+    except (TypeError, ValueError):
+        return None, "Invalid time format (use HH:MM)"
+
+    max_changes = data.get('max_changes', DEFAULT_MAX_CHANGES)
+    if not isinstance(max_changes, int) or not 0 <= max_changes <= 3:
+        return None, "Max changes must be an integer between 0 and 3"
+
+    min_transfer = data.get('min_transfer', DEFAULT_MIN_TRANSFER)
+    if not isinstance(min_transfer, int) or min_transfer < 0:
+        return None, "Minimum transfer must be a non-negative number of minutes"
+
+    requested_mode = data.get('mode')
+    if requested_mode:
+        try:
+            requested_mode = TravelMode(requested_mode)
+        except ValueError:
+            return None, f"Invalid travel mode. Must be one of: {[m.value for m in TravelMode]}"
+
+    departures = route_index.departures()
+    horizon = SEARCH_HORIZON_DAYS * MINUTES_PER_DAY
+
+    # Round-based scan: round k extends the labels of round k-1 by one leg
+    bags = {origin: [Label(start_minute, 0.0, 0, None, None, None)]}
+    frontier = {origin: bags[origin]}
+
+    for _ in range(max_changes + 1):
+        next_frontier = {}
+
+        for stop, labels in frontier.items():
+            if stop == target:
+                continue
+
+            for label in labels:
+                ready = label.arrival if label.connection is None else label.arrival + min_transfer
+
+                for connection in departures.get(stop, ()):
+                    if requested_mode and connection.mode != requested_mode:
+                        continue
+
+                    # Take the first daily run leaving at or after the ready time
+                    day = max(0, -(-(ready - connection.leave_minute) // MINUTES_PER_DAY))
+                    departure = day * MINUTES_PER_DAY + connection.leave_minute
+                    arrival = departure + connection.duration
+                    if departure >= horizon:
+                        continue
+
+                    candidate = Label(
+                        arrival, label.price + connection.price, label.legs + 1,
+                        connection, departure, label
+                    )
+
+                    bag = bags.setdefault(connection.arrive_id, [])
+                    if target in bags and _dominated(candidate, bags[target]):
+                        continue
+                    if _add_to_bag(bag, candidate):
+                        next_frontier.setdefault(connection.arrive_id, []).append(candidate)
+
+        # Labels dominated later in the round are no longer worth extending
+        frontier = {
+            stop: [label for label in labels if any(label is kept for kept in bags[stop])]
+            for stop, labels in next_frontier.items()
+        }
+        if not frontier:
+            break
+
+    arrivals = bags.get(target, [])
+    if not arrivals:
+        return {'earliest': None, 'cheapest': None}, None
+
+    fastest = min(arrivals, key=lambda label: (label.arrival, label.price))
+    cheapest = min(arrivals, key=lambda label: (label.price, label.arrival))
+
+    return {
+        'earliest': _itinerary(fastest, journey_start),
+        'cheapest': _itinerary(cheapest, journey_start)
+    }, None
@@ -0,0 +1,310 @@
+"""Synthetic data at production-like volume, for benchmarks and load tests.
+
+Rows are generated in batches and written with bulk Core inserts and explicit
+ids, so even millions of bookings never go through the ORM unit of work. The
+data is skewed the way real traffic is: a few hub destinations carry most
+routes, departures cluster around the morning and evening peaks, and a minority
+of users and routes account for most bookings.
+"""
+from app.models import (
+    Avenue, Booking, BookingStatus, Destination, GlobalStatus, PaymentMethod, ScannedStatus, SeatClass,
+    SeatInventory, Transaction, TransactionStatus, TransactionType, User, UserRole
+)
+from app.services.fare_service import get_advance_discount, get_class_prices, get_mode_price, get_supported_modes
+from app.services.inventory_service import get_class_capacity
+from app.services.revision_service import AVENUES, DESTINATIONS, bump_revision
+from app.services.rollup_service import rebuild_rollups
+from app.utils.hashing import password_hasher
+from app import db
+from datetime import datetime, time, timedelta, timezone
+from itertools import accumulate
+from sqlalchemy import func, insert, select
+import random
+import secrets
+
+SEED_PASSWORD = 'password123'
+
+CITY_PREFIXES = ['North', 'South', 'East', 'West', 'New', 'Old', 'Upper', 'Lower', 'Port', 'Fort', 'Lake', 'Mount']
+CITY_NAMES = [
+    'Ashford', 'Bramley', 'Carden', 'Dunmore', 'Elston', 'Fairhaven', 'Glenrock', 'Harwick', 'Ivybridge',
+    'Kelso', 'Langley', 'Marlow', 'Newbury', 'Oakham', 'Penrith', 'Queensbury', 'Redcliff', 'Stanton',
+    'Thornbury', 'Upton', 'Ventnor', 'Whitby', 'Yarmouth', 'Zennor'
+]
+
+# Hour of departure, weighted towards the morning and evening peaks
+DEPARTURE_HOUR_WEIGHTS = [1, 1, 1, 1, 2, 4, 8, 10, 9, 6, 5, 5, 5, 5, 5, 6, 8, 10, 9, 6, 4, 3, 2, 1]
+
+SEAT_CLASS_WEIGHTS = {SeatClass.ECONOMY: 75, SeatClass.BUSINESS: 18, SeatClass.FIRST: 7}
+SEAT_COUNT_WEIGHTS = {1: 60, 2: 25, 3: 8, 4: 7}
+BOOKING_STATUS_WEIGHTS = {BookingStatus.CONFIRMED: 85, BookingStatus.CANCELLED: 10, BookingStatus.PENDING: 5}
+
+# Share of the price refunded when a seeded booking was cancelled
+REFUND_SHARE = 0.8
+
+def zipf_weights(count, exponent=1.1):
+    """Cumulative weights for picking rank i with probability proportional to 1 / i**exponent"""
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+def _choices(weights):
+    return list(weights), list(accumulate(weights.values()))
+
+def _next_id(model):
+    return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+def _bulk_insert(model, rows):
+    if rows:
+        db.session.execute(insert(model), rows)
+
+class Seeder:
+    """Generates and inserts one volume of synthetic data; `progress(message)` reports each step"""
+
+    def __init__(self, seed=None, batch_size=10000, days=365, progress=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.days = days
+        self.progress = progress or (lambda message: None)
+        self.now = datetime.now(timezone.utc)
+
+    def _created_at(self, days):
+        return self.now - timedelta(seconds=self.rng.uniform(0, days * 86400))
+
+    def _batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield min(self.batch_size, total - start)
+
+    def destinations(self, count):
+        rng, first_id = self.rng, _next_id(Destination)
+        rows = []
+        for i in range(count):
+            # Lower ids are the hubs: they get airports and stations more often
+            hub = i < max(count // 20, 1)
+            rows.append({
+                'id': first_id + i,
+                'name': f'{rng.choice(CITY_PREFIXES)} {rng.choice(CITY_NAMES)} {first_id + i}',
+                'air': rng.random() < (0.9 if hub else 0.25),
+                'coach': rng.random() < 0.9,
+                'train': rng.random() < (0.95 if hub else 0.55),
+                'status': GlobalStatus.ACTIVE if rng.random() < 0.95 else GlobalStatus.INACTIVE,
+                'created_at': self._created_at(self.days * 2)
+            })
+
+        for start in range(0, count, self.batch_size):
+            _bulk_insert(Destination, rows[start:start + self.batch_size])
+        bump_revision(DESTINATIONS)
+        db.session.commit()
+        self.progress(f'Inserted {count} destinations')
+
+    def avenues(self, count):
+        rng, first_id = self.rng, _next_id(Avenue)
+        destinations = db.session.execute(select(Destination.id).order_by(Destination.id)).scalars().all()
+        if len(destinations) < 2:
+            raise ValueError('At least two destinations are needed to seed avenues')
+
+        popularity = zipf_weights(len(destinations))
+        hours = list(accumulate(DEPARTURE_HOUR_WEIGHTS))
+        inserted = 0
+        for size in self._batches(count):
+            rows = []
+            for _ in range(size):
+                leave, arrive = rng.choices(destinations, cum_weights=popularity, k=2)
+                while arrive == leave:
+                    arrive = rng.choices(destinations, cum_weights=popularity)[0]
+
+                hour = rng.choices(range(24), cum_weights=hours)[0]
+                leave_minutes = hour * 60 + rng.choice(range(0, 60, 5))
+                arrive_minutes = (leave_minutes + rng.randint(45, 600)) % (24 * 60)
+                rows.append({
+                    'id': first_id + inserted,
+                    'leave_destination_id': leave,
+                    'arrive_destination_id': arrive,
+                    'leave_time': time(leave_minutes // 60, leave_minutes % 60),
+                    'arrive_time': time(arrive_minutes // 60, arrive_minutes % 60),
+                    'price': round(rng.lognormvariate(4.3, 0.5), 2),
+                    'status': GlobalStatus.ACTIVE if rng.random() < 0.9 else GlobalStatus.INACTIVE,
+                    'created_at': self._created_at(self.days * 2)
+                })
+                inserted += 1
+            _bulk_insert(Avenue, rows)
+            db.session.commit()
+
+        bump_revision(AVENUES)
+        db.session.commit()
+        self.progress(f'Inserted {count} avenues')
+
+    def users(self, count, password=SEED_PASSWORD):
+        first_id = _next_id(User)
+        # One hash for everybody: hashing millions of passwords would dominate the run
+        password_hash = password_hasher.hash(password)
+        inserted = 0
+        for size in self._batches(count):
+            rows = []
+            for _ in range(size):
+                user_id = first_id + inserted
+                rows.append({
+                    'id': user_id,
+                    'username': f'traveller{user_id}',
+                    'email': f'traveller{user_id}@example.com',
+                    'role': UserRole.MEMBER,
+                    'password_hash': password_hash,
+                    'created_at': self._created_at(self.days * 2)
+                })
+                inserted += 1
+            _bulk_insert(User, rows)
+            db.session.commit()
+        self.progress(f'Inserted {count} users (password {password!r})')
+
+    def _bookable_avenues(self):
+        """(avenue id, base price, supported modes) of active avenues with at least one common mode"""
+        destinations = {row.id: row for row in db.session.execute(
+            select(Destination.id, Destination.air, Destination.coach, Destination.train)
+        )}
+        avenues = []
+        for row in db.session.execute(
+            select(Avenue.id, Avenue.leave_destination_id, Avenue.arrive_destination_id, Avenue.price)
+            .where(Avenue.status == GlobalStatus.ACTIVE)
+            .order_by(Avenue.id)
+        ):
+            modes = get_supported_modes(destinations[row.leave_destination_id], destinations[row.arrive_destination_id])
+            if modes:
+                avenues.append((row.id, row.price, modes))
+        return avenues
+
+    def bookings(self, count):
+        rng = self.rng
+        avenues = self._bookable_avenues()
+        users = db.session.execute(
+            select(User.id).where(User.role == UserRole.MEMBER).order_by(User.id)
+        ).scalars().all()
+        if not avenues or not users:
+            raise ValueError('Bookable avenues and member users are needed to seed bookings')
+
+        # Shuffle before ranking so popularity is not tied to id order
+        rng.shuffle(avenues)
+        rng.shuffle(users)
+        avenue_weights = zipf_weights(len(avenues), 0.8)
+        user_weights = zipf_weights(len(users), 0.6)
+        classes, class_weights = _choices(SEAT_CLASS_WEIGHTS)
+        seats, seat_weights = _choices(SEAT_COUNT_WEIGHTS)
+        statuses, status_weights = _choices(BOOKING_STATUS_WEIGHTS)
+        payment_methods = list(PaymentMethod)
+
+        booking_id, transaction_id = _next_id(Booking), _next_id(Transaction)
+        today = self.now.date()
+        inserted = 0
+        for size in self._batches(count):
+            bookings, transactions = [], []
+            picked_avenues = rng.choices(avenues, cum_weights=avenue_weights, k=size)
+            picked_users = rng.choices(users, cum_weights=user_weights, k=size)
+            picked_classes = rng.choices(classes, cum_weights=class_weights, k=size)
+            picked_seats = rng.choices(seats, cum_weights=seat_weights, k=size)
+            picked_statuses = rng.choices(statuses, cum_weights=status_weights, k=size)
+
+            for (avenue_id, base_price, modes), user_id, seat_class, seat, status in zip(
+                picked_avenues, picked_users, picked_classes, picked_seats, picked_statuses
+            ):
+                created_at = self._created_at(self.days)
+                # Most trips are booked a couple of weeks out, a few months ahead
+                journey = created_at.date() + timedelta(days=min(int(rng.expovariate(1 / 18)), 120))
+                mode = rng.choice(modes)
+                discount = get_advance_discount((journey - created_at.date()).days)
+                price = round(get_class_prices(get_mode_price(base_price, mode), discount)[seat_class.value] * seat, 2)
+                scanned = status == BookingStatus.CONFIRMED and journey < today and rng.random() < 0.9
+
+                bookings.append({
+                    'id': booking_id,
+                    'identifier': f'BK-{secrets.token_hex(8)}',
+                    'avenue_id': avenue_id,
+                    'user_id': user_id,
+                    'date': journey,
+                    'mode': mode,
+                    'type': seat_class,
+                    'seat': seat,
+                    'price': price,
+                    'status': status,
+                    'ticket': ScannedStatus.SCANNED if scanned else ScannedStatus.UNSCANNED,
+                    'created_at': created_at,
+                    'updated_at': created_at
+                })
+
+                method = rng.choice(payment_methods)
+                transactions.append({
+                    'id': transaction_id,
+                    'identifier': f'TXN-{secrets.token_hex(8)}',
+                    'booking_id': booking_id,
+                    'amount': price,
+                    'payment_method': method,
+                    'status': TransactionStatus.PENDING if status == BookingStatus.PENDING else TransactionStatus.SUCCESS,
+                    'type': TransactionType.PAYMENT,
+                    'created_at': created_at
+                })
+                transaction_id += 1
+
+                if status == BookingStatus.CANCELLED:
+                    transactions.append({
+                        'id': transaction_id,
+                        'identifier': f'RF-{secrets.token_hex(8)}',
+                        'booking_id': booking_id,
+                        'amount': round(price * REFUND_SHARE, 2),
+                        'payment_method': method,
+                        'status': TransactionStatus.SUCCESS,
+                        'type': TransactionType.REFUND,
+                        'created_at': created_at + timedelta(hours=rng.randint(1, 72))
+                    })
+                    transaction_id += 1
+
+                booking_id += 1
+
+            _bulk_insert(Booking, bookings)
+            _bulk_insert(Transaction, transactions)
+            db.session.commit()
+            inserted += size
+            self.progress(f'Inserted {inserted}/{count} bookings')
+
+    def inventory(self):
+        """Rebuild seat_inventory from the confirmed bookings, the only ones holding seats"""
+        db.session.query(SeatInventory).delete()
+        booked = db.session.execute(
+            select(Booking.avenue_id, Booking.date, Booking.mode, Booking.type, func.sum(Booking.seat))
+            .where(Booking.status == BookingStatus.CONFIRMED)
+            .group_by(Booking.avenue_id, Booking.date, Booking.mode, Booking.type)
+        )
+
+        rows, total = [], 0
+        for avenue_id, journey, mode, seat_class, seats in booked:
+            capacity = get_class_capacity(mode, seat_class)
+            rows.append({
+                'avenue_id': avenue_id,
+                'date': journey,
+                'mode': mode,
+                'type': seat_class,
+                'capacity': capacity,
+                # The rare departure the skew oversells is shown as full
+                'booked': min(seats, capacity),
+                'updated_at': self.now
+            })
+            if len(rows) == self.batch_size:
+                _bulk_insert(SeatInventory, rows)
+                total += len(rows)
+                rows = []
+        _bulk_insert(SeatInventory, rows)
+        total += len(rows)
+        db.session.commit()
+        self.progress(f'Rebuilt {total} seat inventory rows')
+
+    def rollups(self):
+        booking_rows, revenue_rows = rebuild_rollups()
+        self.progress(f'Rebuilt {booking_rows} daily booking rows and {revenue_rows} daily revenue rows')
+
+def seed(destinations=0, avenues=0, users=0, bookings=0, password=SEED_PASSWORD, seed=None, batch_size=10000, days=365, progress=None):
+    """Append the requested volume of each table, then rebuild the derived tables"""
+    seeder = Seeder(seed=seed, batch_size=batch_size, days=days, progress=progress)
+    if destinations:
+        seeder.destinations(destinations)
+    if avenues:
+        seeder.avenues(avenues)
+    if users:
+        seeder.users(users, password)
+    if bookings:
+        seeder.bookings(bookings)
+        seeder.inventory()
+        seeder.rollups()
@@ -1,9 +1,8 @@
-from app.models import Booking, BookingStatus, GlobalStatus, ScannedStatus, Transaction, TransactionStatus, TransactionType, User, Avenue, Destination
+from app.models import Booking, BookingStatus, DailyBookingStats, DailyRevenueStats, GlobalStatus, ScannedStatus, TransactionStatus, TransactionType, User, Avenue, Destination
 from sqlalchemy import func
 from app import db
 from datetime import datetime, timedelta
-from sqlalchemy import extract
-from calendar import month_name, day_name
+from calendar import month_name
 
 def get_user_stats(user_id):
     # Get user-specific booking stats
@@ -35,22 +34,23 @@ def get_user_stats(user_id):
 def get_admin_stats():
     # Booking stats
     booking_stats = db.session.query(
-        Booking.status,
-        func.count(Booking.id)
-    ).group_by(Booking.status).all()
-    booking_counts = {status.value: count for status, count in booking_stats}
+        DailyBookingStats.status,
+        func.sum(DailyBookingStats.bookings)
+    ).group_by(DailyBookingStats.status).all()
+    booking_counts = {status.value: count or 0 for status, count in booking_stats}
     
-    # Transaction stats
+    # Transaction stats (successful transactions only)
     transaction_stats = db.session.query(
-        Transaction.type,
-        func.sum(Transaction.amount).filter(Transaction.status == TransactionStatus.SUCCESS)
-    ).group_by(Transaction.type).all()
-    transaction_sums = {type.value: amount for type, amount in transaction_stats}
+        DailyRevenueStats.type,
+        func.sum(DailyRevenueStats.amount),
+        func.sum(DailyRevenueStats.transactions)
+    ).filter(
+        DailyRevenueStats.status == TransactionStatus.SUCCESS
+    ).group_by(DailyRevenueStats.type).all()
+    transaction_sums = {type.value: amount or 0 for type, amount, count in transaction_stats}
     
     # Total transactions (count of successful transactions)
-    total_transactions = db.session.query(func.count(Transaction.id)).filter(
-        Transaction.status == TransactionStatus.SUCCESS
-    ).scalar()
+    total_transactions = sum(count or 0 for type, amount, count in transaction_stats)
 
     # Counts
     total_users = db.session.query(func.count(User.id)).scalar()
@@ -69,193 +69,100 @@ def get_admin_stats():
         'total_transactions': total_transactions,
     }
 
-def get_time_periods(time_range):
-    now = datetime.now()
-    if time_range == 'week':
-        # Last 7 days (Sunday to Saturday)
-        start_date = now - timedelta(days=now.weekday() + 1)  # Start from previous Sunday
-        periods = [
-            (start_date + timedelta(days=i)).strftime('%A') 
-            for i in range(7)
-        ]
-    elif time_range == 'month':
+def get_time_buckets(time_range):
+    """Periods of a chart with the [start, end) range they cover and a date -> period index mapper"""
+    today = datetime.now().date()
+    if time_range == 'month':
         # Current month weeks (Week 1 to Week 4/5)
-        first_day = now.replace(day=1)
-        last_day = (now.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-        total_weeks = (last_day.day - 1) // 7 + 1
+        start = today.replace(day=1)
+        end = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        total_weeks = ((end - start).days - 1) // 7 + 1
         periods = [f"Week {i+1}" for i in range(total_weeks)]
+        bucket_of = lambda day: (day - start).days // 7
     elif time_range == 'year':
-        # All 12 months
+        # All 12 months of the current year
+        start = today.replace(month=1, day=1)
+        end = start.replace(year=start.year + 1)
         periods = [month_name[i] for i in range(1, 13)]
+        bucket_of = lambda day: day.month - 1
     else:
-        # Default to week if no range specified
+        # Default to week if no range specified: Sunday to Saturday
         time_range = 'week'
-        start_date = now - timedelta(days=now.weekday() + 1)
+        start = today - timedelta(days=(today.weekday() + 1) % 7)
+        end = start + timedelta(days=7)
         periods = [
-            (start_date + timedelta(days=i)).strftime('%A') 
+            (start + timedelta(days=i)).strftime('%A') 
             for i in range(7)
         ]
+        bucket_of = lambda day: (day - start).days
     
-    return time_range, periods
+    return time_range, periods, start, end, bucket_of
+
+def get_bucketed_totals(day, key, aggregate, time_range, *filters):
+    """One GROUP BY per chart over a daily rollup: totals per (period index, key)"""
+    time_range, periods, start, end, bucket_of = get_time_buckets(time_range)
+    
+    rows = db.session.query(day, key, aggregate).filter(
+        day >= start,
+        day < end,
+        *filters
+    ).group_by(day, key).all()
+    
+    totals = [dict() for _ in periods]
+    for row_day, row_key, value in rows:
+        bucket = bucket_of(row_day)
+        if 0 <= bucket < len(periods):
+            totals[bucket][row_key] = totals[bucket].get(row_key, 0) + (value or 0)
+    
+    return periods, totals
 
 def get_admin_booking_stats(time_range=None):
-    time_range, periods = get_time_periods(time_range)
-    results = []
+    periods, totals = get_bucketed_totals(
+        DailyBookingStats.day, DailyBookingStats.status, func.sum(DailyBookingStats.bookings), time_range
+    )
     
-    for period in periods:
-        if time_range == 'week':
-            # Day of week filter
-            day_num = list(day_name).index(period)
-            stats = db.session.query(
-                Booking.status,
-                func.count(Booking.id)
-            ).filter(
-                extract('dow', Booking.created_at) == day_num
-            ).group_by(Booking.status).all()
-        elif time_range == 'month':
-            # Week of month filter
-            week_num = int(period.split(' ')[1])
-            stats = db.session.query(
-                Booking.status,
-                func.count(Booking.id)
-            ).filter(
-                extract('week', Booking.created_at) == extract('week', datetime.now()) - (4 - week_num)
-            ).group_by(Booking.status).all()
-        elif time_range == 'year':
-            # Month filter
-            month_num = list(month_name).index(period)
-            stats = db.session.query(
-                Booking.status,
-                func.count(Booking.id)
-            ).filter(
-                extract('month', Booking.created_at) == month_num
-            ).group_by(Booking.status).all()
-        
-        completed = sum(count for status, count in stats if status == BookingStatus.CONFIRMED)
-        cancelled = sum(count for status, count in stats if status == BookingStatus.CANCELLED)
-        
-        results.append({
-            'period': period,
-            'completed': completed,
-            'cancelled': cancelled
-        })
-    
-    return results
+    return [{
+        'period': period,
+        'completed': counts.get(BookingStatus.CONFIRMED, 0),
+        'cancelled': counts.get(BookingStatus.CANCELLED, 0)
+    } for period, counts in zip(periods, totals)]
 
 def get_admin_ticket_stats(time_range=None):
-    time_range, periods = get_time_periods(time_range)
-    results = []
+    periods, totals = get_bucketed_totals(
+        DailyBookingStats.day, DailyBookingStats.ticket, func.sum(DailyBookingStats.bookings), time_range,
+        DailyBookingStats.status == BookingStatus.CONFIRMED
+    )
     
-    for period in periods:
-        if time_range == 'week':
-            day_num = list(day_name).index(period)
-            stats = db.session.query(
-                Booking.ticket,
-                func.count(Booking.id)
-            ).filter(
-                Booking.status == BookingStatus.CONFIRMED,
-                extract('dow', Booking.created_at) == day_num
-            ).group_by(Booking.ticket).all()
-        elif time_range == 'month':
-            week_num = int(period.split(' ')[1])
-            stats = db.session.query(
-                Booking.ticket,
-                func.count(Booking.id)
-            ).filter(
-                Booking.status == BookingStatus.CONFIRMED,
-                extract('week', Booking.created_at) == extract('week', datetime.now()) - (4 - week_num)
-            ).group_by(Booking.ticket).all()
-        elif time_range == 'year':
-            month_num = list(month_name).index(period)
-            stats = db.session.query(
-                Booking.ticket,
-                func.count(Booking.id)
-            ).filter(
-                Booking.status == BookingStatus.CONFIRMED,
-                extract('month', Booking.created_at) == month_num
-            ).group_by(Booking.ticket).all()
-        
-        scanned = sum(count for ticket, count in stats if ticket == ScannedStatus.SCANNED)
-        unscanned = sum(count for ticket, count in stats if ticket == ScannedStatus.UNSCANNED)
-        
-        results.append({
-            'period': period,
-            'scanned': scanned,
-            'unscanned': unscanned
-        })
-    
-    return results
+    return [{
+        'period': period,
+        'scanned': counts.get(ScannedStatus.SCANNED, 0),
+        'unscanned': counts.get(ScannedStatus.UNSCANNED, 0)
+    } for period, counts in zip(periods, totals)]
 
 def get_admin_transaction_stats(time_range=None):
-    time_range, periods = get_time_periods(time_range)
-    results = []
-    
-    for period in periods:
-        if time_range == 'week':
-            day_num = list(day_name).index(period)
-            stats = db.session.query(
-                Transaction.type,
-                func.sum(Transaction.amount)
-            ).filter(
-                Transaction.status == TransactionStatus.SUCCESS,
-                extract('dow', Transaction.created_at) == day_num
-            ).group_by(Transaction.type).all()
-        elif time_range == 'month':
-            week_num = int(period.split(' ')[1])
-            stats = db.session.query(
-                Transaction.type,
-                func.sum(Transaction.amount)
-            ).filter(
-                Transaction.status == TransactionStatus.SUCCESS,
-                extract('week', Transaction.created_at) == extract('week', datetime.now()) - (4 - week_num)
-            ).group_by(Transaction.type).all()
-        elif time_range == 'year':
-            month_num = list(month_name).index(period)
-            stats = db.session.query(
-                Transaction.type,
-                func.sum(Transaction.amount)
-            ).filter(
-                Transaction.status == TransactionStatus.SUCCESS,
-                extract('month', Transaction.created_at) == month_num
-            ).group_by(Transaction.type).all()
-        
-        payment = sum(amount for type, amount in stats if type == TransactionType.PAYMENT)
-        refund = sum(amount for type, amount in stats if type == TransactionType.REFUND)
-        
-        results.append({
-            'period': period,
-            'payment': payment,
-            'refund': refund
-        })
+    periods, totals = get_bucketed_totals(
+        DailyRevenueStats.day, DailyRevenueStats.type, func.sum(DailyRevenueStats.amount), time_range,
+        DailyRevenueStats.status == TransactionStatus.SUCCESS
+    )
     
-    return results
+    return [{
+        'period': period,
+        'payment': amounts.get(TransactionType.PAYMENT, 0),
+        'refund': amounts.get(TransactionType.REFUND, 0)
+    } for period, amounts in zip(periods, totals)]
 
 def get_monthly_sales_stats():
     """Get monthly sales breakdown for the current year"""
-    current_year = datetime.now().year
-    
-    # Get monthly sales data
-    monthly_stats = db.session.query(
-        extract('month', Booking.created_at).label('month'),
-        func.sum(Booking.price).label('total_sales')
-    ).filter(
-        Booking.status == BookingStatus.CONFIRMED,
-        extract('year', Booking.created_at) == current_year
-    ).group_by('month').order_by('month').all()
+    periods, totals = get_bucketed_totals(
+        DailyBookingStats.day, DailyBookingStats.status, func.sum(DailyBookingStats.revenue), 'year',
+        DailyBookingStats.status == BookingStatus.CONFIRMED
+    )
     
-    # Format as month names with sales
-    result = {
-        month_name[int(month)]: float(total_sales) 
-        for month, total_sales in monthly_stats
+    # Every month is present, even with 0 sales
+    return {
+        month: float(sales.get(BookingStatus.CONFIRMED, 0))
+        for month, sales in zip(periods, totals)
     }
-    
-    # Ensure all months are present (even with 0 sales)
-    for i in range(1, 13):
-        month = month_name[i]
-        if month not in result:
-            result[month] = 0.0
-    
-    return result
 
 def get_top_customers_stats(limit=5):
     """Get top customers by spending"""
@@ -0,0 +1,107 @@
+from app.models import Avenue, Destination
+from app.services.invalidation_service import bus
+from app.services.revision_service import AVENUES, DESTINATIONS, get_revisions
+from app import db
+from collections import namedtuple
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from types import MappingProxyType
+import threading
+
+# Compact, read-only stand-ins for the ORM rows; the serializers read them the same way
+DestinationRecord = namedtuple('DestinationRecord', [
+    'id', 'name', 'air', 'coach', 'train', 'status', 'created_at'
+])
+
+AvenueRecord = namedtuple('AvenueRecord', [
+    'id', 'leave_destination_id', 'arrive_destination_id', 'leave_time', 'arrive_time',
+    'price', 'status', 'created_at', 'leave_destination', 'arrive_destination'
+])
+
+def _departure_order(avenue):
+    return (avenue.leave_time, avenue.id)
+
+def _group(avenues, attribute):
+    groups = {}
+    for avenue in avenues:
+        groups.setdefault(getattr(avenue, attribute), []).append(avenue)
+    return MappingProxyType({key: tuple(group) for key, group in groups.items()})
+
+class Timetable:
+    """Immutable snapshot of destinations and avenues, indexed for the read endpoints"""
+
+    def __init__(self, version, destinations, avenues):
+        # (destinations revision, avenues revision) the snapshot was built from
+        self.version = version
+
+        self.destinations = MappingProxyType({d.id: d for d in destinations})
+        self.destinations_by_created = tuple(sorted(destinations, key=lambda d: d.created_at, reverse=True))
+        self.destinations_by_name = tuple(sorted(destinations, key=lambda d: d.name))
+
+        # Every avenue list is in departure order, which is also the listing order
+        self.avenues = MappingProxyType({a.id: a for a in avenues})
+        self.avenues_by_departure = tuple(sorted(avenues, key=_departure_order))
+        self.avenues_by_leave = _group(self.avenues_by_departure, 'leave_destination_id')
+        self.avenues_by_arrive = _group(self.avenues_by_departure, 'arrive_destination_id')
+
+def build_timetable():
+    """Read both tables with two Core queries and build a new snapshot"""
+    revisions = get_revisions((DESTINATIONS, AVENUES))
+
+    destinations = {
+        row.id: DestinationRecord(**row._mapping)
+        for row in db.session.execute(select(*[getattr(Destination, f) for f in DestinationRecord._fields]))
+    }
+
+    columns = [getattr(Avenue, f) for f in AvenueRecord._fields if f not in ('leave_destination', 'arrive_destination')]
+    avenues = [
+        AvenueRecord(
+            **row._mapping,
+            leave_destination=destinations[row.leave_destination_id],
+            arrive_destination=destinations[row.arrive_destination_id]
+        )
+        for row in db.session.execute(select(*columns))
+    ]
+
+    return Timetable((revisions[DESTINATIONS], revisions[AVENUES]), list(destinations.values()), avenues)
+
+class TimetableStore:
+    """Holds the current timetable snapshot and swaps in a new one after admin changes"""
+
+    def __init__(self):
+        self._current = None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        current = self._current
+        if current is None:
+            with self._lock:
+                if self._current is None:
+                    self._current = build_timetable()
+                current = self._current
+        return current
+
+    def reload(self):
+        """Rebuild after a committed change; readers keep the old snapshot until the swap"""
+        with self._lock:
+            # Serialized so a slower rebuild never replaces a newer snapshot
+            self._current = build_timetable()
+
+    def preload(self):
+        """Load at startup, tolerating a database that has not been migrated yet"""
+        try:
+            self.reload()
+        except SQLAlchemyError:
+            db.session.rollback()
+        finally:
+            db.session.remove()
+
+    def reset(self):
+        with self._lock:
+            self._current = None
+
+timetable = TimetableStore()
+
+# Another worker changed the timetable: rebuild lazily on the next read
+bus.subscribe(DESTINATIONS, lambda entity_id: timetable.reset())
+bus.subscribe(AVENUES, lambda entity_id: timetable.reset())
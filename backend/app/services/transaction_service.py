@@ -1,5 +1,8 @@
-from app.models import PaymentMethod, Transaction, TransactionStatus, TransactionType
+from app.models import Avenue, Booking, PaymentMethod, Transaction, TransactionStatus, TransactionType
 from app import db
+from app.services.rollup_service import record_transaction
+from app.utils.pagination import paginate
+from sqlalchemy.orm import joinedload
 import secrets
 
 def create_transaction(data):
@@ -14,6 +17,8 @@ def create_transaction(data):
         )
 
         db.session.add(transaction)
+        db.session.flush()
+        record_transaction(transaction)
         db.session.commit()
 
         return transaction, None
@@ -27,15 +32,25 @@ def get_transaction(transaction_id):
         return None, "Transaction not found"
     return transaction, None
 
-def get_all_transactions(status=None, booking_id=None):
-    query = Transaction.query
+def with_transaction_details(query):
+    """Eager-load the booking, its user, avenue and destinations of each transaction"""
+    booking = joinedload(Transaction.booking)
+    avenue = booking.joinedload(Booking.avenue)
+    return query.options(
+        booking.joinedload(Booking.user),
+        avenue.joinedload(Avenue.leave_destination),
+        avenue.joinedload(Avenue.arrive_destination)
+    )
+
+def get_all_transactions(status=None, booking_id=None, cursor=None, limit=None):
+    query = with_transaction_details(Transaction.query)
     
     if status:
         query = query.filter_by(status=TransactionStatus(status))
     if booking_id:
         query = query.filter_by(booking_id=booking_id)
     
-    return query.order_by(Transaction.created_at.desc()).all()
+    return paginate(query, [Transaction.created_at, Transaction.id], cursor, limit)
 
 def update_transaction_status(transaction_id, new_status):
     transaction = Transaction.query.get(transaction_id)
@@ -43,7 +58,10 @@ def update_transaction_status(transaction_id, new_status):
         return None, "Transaction not found"
     
     try:
-        transaction.status = TransactionStatus(new_status)
+        status = TransactionStatus(new_status)
+        record_transaction(transaction, -1)
+        transaction.status = status
+        record_transaction(transaction)
         db.session.commit()
         return transaction, None
     except Exception as e:
@@ -0,0 +1,613 @@
+"""Caching shared by the services: a Flask extension over interchangeable backends.
+
+`cache.get/set/add/delete/incr/lock` behave the same whichever backend
+CACHE_BACKEND selects, so a service never needs to know where entries live:
+
+- memory: a bounded LRU inside each worker process (the default)
+- shared: a fixed-size table in an mmapped file, shared by every worker on the host
+- redis: any server speaking the Redis protocol, shared by every host
+
+A `ttl` of None means the configured default and 0 means no expiry. The shared
+and redis backends pickle values, so only point them at files and servers the
+app alone can write to.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import socket
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARED_PATH = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'horizon-cache')
+
+class CacheError(Exception):
+    """Raised when a cache backend cannot be reached or rejects a command"""
+
+class CacheDecodeError(CacheError):
+    """Raised when a stored entry cannot be unpickled, e.g. one left by an older release"""
+
+def _unpickle(data):
+    try:
+        return pickle.loads(data)
+    except Exception as error:
+        raise CacheDecodeError(f'Undecodable cache entry: {error!r}') from error
+
+class CacheLockTimeout(Exception):
+    """Raised when a cache lock could not be acquired in time"""
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries also expire after `ttl` seconds"""
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expiry(self, ttl):
+        ttl = self.ttl if ttl is None else ttl
+        return time.monotonic() + ttl if ttl else None
+
+    def _live(self, key):
+        # Caller holds the lock
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def _store(self, key, value, expires_at):
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return default
+
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, self._expiry(ttl))
+        return True
+
+    def add(self, key, value, ttl=None):
+        """Set only if the key is absent; returns whether it was set"""
+        with self._lock:
+            if self._live(key) is not None:
+                return False
+            self._store(key, value, self._expiry(ttl))
+            return True
+
+    def incr(self, key, delta=1, ttl=None):
+        """Add `delta` to an integer entry, creating it with `ttl`; returns the new value"""
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                value, expires_at = delta, self._expiry(ttl)
+            else:
+                value, expires_at = entry[0] + delta, entry[1]
+            self._store(key, value, expires_at)
+            return value
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def delete_if_equal(self, key, value):
+        with self._lock:
+            entry = self._live(key)
+            if entry is None or entry[0] != value:
+                return False
+            del self._data[key]
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class MemoryBackend(TTLCache):
+    """Per-process backend; values are stored as-is, so callers must not mutate what they get"""
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(maxsize=config.get('CACHE_MAX_ENTRIES', 4096), ttl=0)
+
+class SharedMemoryBackend:
+    """Fixed-size table in an mmapped file, shared by every process on the host
+
+    A key hashes to a bucket of WAYS slots; a full bucket evicts the entry closest
+    to expiry. Each slot holds one pickled (key, value) pair. Values too large for
+    a slot are not cached but counted in `oversized_writes` and logged, so size
+    CACHE_SHARED_SLOT_SIZE for the largest results worth caching. Writers hold an
+    flock on the file, so no worker ever reads a half-written slot.
+    """
+
+    MAGIC = b'HZC1'
+    HEADER = struct.Struct('<4sII')
+    # key digest, absolute expiry (0 = never), payload length
+    SLOT = struct.Struct('<QdI')
+    WAYS = 8
+    # Seconds between warnings about values too large for a slot
+    OVERSIZE_WARNING_INTERVAL = 60
+
+    def __init__(self, path=DEFAULT_SHARED_PATH, slots=1024, slot_size=65536):
+        if fcntl is None:
+            raise CacheError('The shared cache backend needs fcntl, which this platform lacks')
+        if slot_size <= self.SLOT.size:
+            raise CacheError(f'Shared cache slots must be larger than {self.SLOT.size} bytes')
+
+        self.path = path
+        self.buckets = max(slots // self.WAYS, 1)
+        self.slot_size = slot_size
+        self.size = self.HEADER.size + self.buckets * self.WAYS * slot_size
+        self._header = self.HEADER.pack(self.MAGIC, self.buckets, slot_size)
+        self._pid = None
+        self._fd = None
+        self._map = None
+        self._lock = threading.Lock()
+        self.oversized_writes = 0
+        self._oversize_warned = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            path=config.get('CACHE_SHARED_PATH', DEFAULT_SHARED_PATH),
+            slots=config.get('CACHE_SHARED_SLOTS', 1024),
+            slot_size=config.get('CACHE_SHARED_SLOT_SIZE', 65536)
+        )
+
+    def _open(self):
+        # flock belongs to the open file, so every forked worker needs a descriptor of its own
+        if self._pid == os.getpid():
+            return
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size != self.size or os.pread(fd, self.HEADER.size, 0) != self._header:
+                # New file, or laid out by a differently configured app: start empty
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self.size)
+                os.pwrite(fd, self._header, 0)
+            self._map = mmap.mmap(fd, self.size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+        self._fd = fd
+        self._pid = os.getpid()
+
+    @contextmanager
+    def _locked(self, exclusive=False):
+        with self._lock:
+            self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield self._map
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _digest(key):
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+        # 0 marks an empty slot
+        return digest or 1
+
+    def _slots(self, digest):
+        first = self.HEADER.size + (digest % self.buckets) * self.WAYS * self.slot_size
+        return range(first, first + self.WAYS * self.slot_size, self.slot_size)
+
+    def _find(self, mm, key, purge=False):
+        """(offset, value, expires) of the live entry for `key`, or (None, None, None)
+
+        An undecodable slot raises CacheDecodeError, or is cleared when `purge`
+        is set (the caller then holds the exclusive lock).
+        """
+        digest, now = self._digest(key), time.time()
+        for offset in self._slots(digest):
+            slot_digest, expires, length = self.SLOT.unpack_from(mm, offset)
+            if slot_digest != digest or (expires and expires <= now):
+                continue
+            start = offset + self.SLOT.size
+            try:
+                stored_key, value = _unpickle(mm[start:start + length])
+            except CacheDecodeError:
+                if not purge:
+                    raise
+                self._clear_slot(mm, offset)
+                continue
+            if stored_key == key:
+                return offset, value, expires
+        return None, None, None
+
+    def _victim(self, mm, digest):
+        # An empty or expired slot if there is one, otherwise the entry closest to expiry
+        now, best, best_expires = time.time(), None, None
+        for offset in self._slots(digest):
+            slot_digest, expires, _ = self.SLOT.unpack_from(mm, offset)
+            if not slot_digest or (expires and expires <= now):
+                return offset
+            expires = expires or float('inf')
+            if best is None or expires < best_expires:
+                best, best_expires = offset, expires
+        return best
+
+    def _store(self, mm, key, value, expires, offset=None):
+        payload = pickle.dumps((key, value), pickle.HIGHEST_PROTOCOL)
+        if self.SLOT.size + len(payload) > self.slot_size:
+            if offset is not None:
+                self._clear_slot(mm, offset)
+            self._oversized(key, len(payload))
+            return False
+
+        if offset is None:
+            offset = self._victim(mm, self._digest(key))
+        # Payload first, header last: the header is what makes the slot visible
+        mm[offset + self.SLOT.size:offset + self.SLOT.size + len(payload)] = payload
+        self.SLOT.pack_into(mm, offset, self._digest(key), expires, len(payload))
+        return True
+
+    def _clear_slot(self, mm, offset):
+        self.SLOT.pack_into(mm, offset, 0, 0, 0)
+
+    def _oversized(self, key, length):
+        # Caller holds the lock
+        self.oversized_writes += 1
+        now = time.monotonic()
+        if self._oversize_warned is None or now - self._oversize_warned >= self.OVERSIZE_WARNING_INTERVAL:
+            self._oversize_warned = now
+            logger.warning(
+                'Shared cache skipped %d writes too large for its %d-byte slots (latest %r, %d bytes); '
+                'raise CACHE_SHARED_SLOT_SIZE to cache them', self.oversized_writes, self.slot_size, key, length
+            )
+
+    @staticmethod
+    def _expiry(ttl):
+        return time.time() + ttl if ttl else 0
+
+    def get(self, key, default=None):
+        with self._locked() as mm:
+            offset, value, _ = self._find(mm, key)
+        return default if offset is None else value
+
+    def set(self, key, value, ttl=0):
+        with self._locked(exclusive=True) as mm:
+            offset, _, _ = self._find(mm, key, purge=True)
+            return self._store(mm, key, value, self._expiry(ttl), offset)
+
+    def add(self, key, value, ttl=0):
+        with self._locked(exclusive=True) as mm:
+            if self._find(mm, key, purge=True)[0] is not None:
+                return False
+            return self._store(mm, key, value, self._expiry(ttl))
+
+    def incr(self, key, delta=1, ttl=0):
+        with self._locked(exclusive=True) as mm:
+            offset, value, expires = self._find(mm, key, purge=True)
+            if offset is None:
+                value, expires = delta, self._expiry(ttl)
+            else:
+                value += delta
+            self._store(mm, key, value, expires, offset)
+            return value
+
+    def delete(self, key):
+        with self._locked(exclusive=True) as mm:
+            offset = self._find(mm, key, purge=True)[0]
+            if offset is None:
+                return False
+            self._clear_slot(mm, offset)
+            return True
+
+    def delete_if_equal(self, key, value):
+        with self._locked(exclusive=True) as mm:
+            offset, current, _ = self._find(mm, key, purge=True)
+            if offset is None or current != value:
+                return False
+            self._clear_slot(mm, offset)
+            return True
+
+    def clear(self):
+        with self._locked(exclusive=True) as mm:
+            mm[self.HEADER.size:] = bytes(self.size - self.HEADER.size)
+
+class RespConnection:
+    """One socket speaking RESP, the Redis serialization protocol"""
+
+    def __init__(self, host, port, timeout):
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.reader = self.sock.makefile('rb')
+        self.pid = os.getpid()
+
+    def command(self, *args):
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(arg), arg))
+        self.sock.sendall(b''.join(parts))
+        return self._reply()
+
+    def _reply(self):
+        line = self.reader.readline()
+        if not line.endswith(b'\r\n'):
+            raise ConnectionError('Connection closed by the cache server')
+
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest.decode()
+        if kind == b'-':
+            raise CacheError(rest.decode())
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            return None if length < 0 else self.reader.read(length + 2)[:-2]
+        if kind == b'*':
+            length = int(rest)
+            return None if length < 0 else [self._reply() for _ in range(length)]
+        raise ConnectionError(f'Unexpected reply from the cache server: {line!r}')
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+class RedisBackend:
+    """Backend for any Redis-protocol server, with one connection per thread
+
+    Integers are stored as plain numbers so INCRBY works on them; anything else
+    is pickled.
+    """
+
+    # Delete the lock key only while it still holds the caller's token
+    RELEASE_SCRIPT = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) else return 0 end"
+
+    def __init__(self, url='redis://localhost:6379/0', timeout=1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.database = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            url=config.get('CACHE_REDIS_URL', 'redis://localhost:6379/0'),
+            timeout=config.get('CACHE_REDIS_TIMEOUT', 1.0)
+        )
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        # A forked worker must not talk over its parent's socket
+        if connection is None or connection.pid != os.getpid():
+            connection = RespConnection(self.host, self.port, self.timeout)
+            if self.password:
+                connection.command('AUTH', self.password)
+            if self.database:
+                connection.command('SELECT', self.database)
+            self._local.connection = connection
+        return connection
+
+    def execute(self, *args):
+        try:
+            return self._connection().command(*args)
+        except (OSError, ConnectionError) as error:
+            connection = getattr(self._local, 'connection', None)
+            self._local.connection = None
+            if connection is not None:
+                connection.close()
+            raise CacheError(f'Cache server unavailable: {error}') from error
+
+    @staticmethod
+    def _dumps(value):
+        if type(value) is int:
+            return str(value).encode()
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _loads(data):
+        # Pickles start with the PROTO opcode; anything else is a counter
+        if data[:1] == b'\x80':
+            return _unpickle(data)
+        try:
+            return int(data)
+        except ValueError as error:
+            raise CacheDecodeError(f'Undecodable cache entry: {error!r}') from error
+
+    @staticmethod
+    def _expiry(ttl):
+        return ('PX', int(ttl * 1000)) if ttl else ()
+
+    def get(self, key, default=None):
+        data = self.execute('GET', key)
+        return default if data is None else self._loads(data)
+
+    def set(self, key, value, ttl=0):
+        return self.execute('SET', key, self._dumps(value), *self._expiry(ttl)) == 'OK'
+
+    def add(self, key, value, ttl=0):
+        return self.execute('SET', key, self._dumps(value), *self._expiry(ttl), 'NX') == 'OK'
+
+    def incr(self, key, delta=1, ttl=0):
+        value = self.execute('INCRBY', key, delta)
+        if value == delta and ttl:
+            # The counter was just created
+            self.execute('PEXPIRE', key, int(ttl * 1000))
+        return value
+
+    def delete(self, key):
+        return self.execute('DEL', key) > 0
+
+    def delete_if_equal(self, key, value):
+        return self.execute('EVAL', self.RELEASE_SCRIPT, 1, key, self._dumps(value)) > 0
+
+    def clear(self, pattern='*'):
+        """Delete the keys matching `pattern`, leaving the rest of a shared server alone"""
+        cursor = 0
+        while True:
+            cursor, keys = self.execute('SCAN', cursor, 'MATCH', pattern, 'COUNT', 500)
+            if keys:
+                self.execute('DEL', *keys)
+            if int(cursor) == 0:
+                break
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'shared': SharedMemoryBackend,
+    'redis': RedisBackend
+}
+
+class CacheLock:
+    """Lock held as a cache key, so it spans every worker sharing the backend
+
+    `timeout` bounds how long a crashed holder can keep it; only the holder's
+    token releases it.
+    """
+
+    def __init__(self, cache, name, timeout=10, blocking_timeout=None, sleep=0.01):
+        self.cache = cache
+        self.name = name
+        self.key = f'lock:{name}'
+        self.timeout = timeout
+        self.blocking_timeout = blocking_timeout
+        self.sleep = sleep
+        self.token = None
+
+    def acquire(self, blocking=True):
+        token = uuid.uuid4().hex
+        deadline = None if self.blocking_timeout is None else time.monotonic() + self.blocking_timeout
+        while not self.cache.add(self.key, token, ttl=self.timeout):
+            if not blocking or (deadline is not None and time.monotonic() >= deadline):
+                return False
+            time.sleep(self.sleep)
+        self.token = token
+        return True
+
+    def release(self):
+        if self.token is not None:
+            self.cache.delete_if_equal(self.key, self.token)
+            self.token = None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise CacheLockTimeout(f'Could not acquire the {self.name!r} lock')
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+class Cache:
+    """Flask extension giving every service the same cache API over the configured backend
+
+    A backend that cannot be reached degrades reads to misses and writes to
+    no-ops; `incr` and `lock` raise CacheError instead, since their callers
+    rely on the result. An entry that cannot be decoded is deleted and read as
+    a miss.
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryBackend(ttl=0)
+        self.prefix = ''
+        self.default_ttl = 300
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        name = app.config.get('CACHE_BACKEND', 'memory')
+        if name not in BACKENDS:
+            raise CacheError(f"Unknown cache backend {name!r}. Must be one of: {', '.join(BACKENDS)}")
+
+        self.backend = BACKENDS[name].from_config(app.config)
+        self.prefix = app.config.get('CACHE_KEY_PREFIX', '')
+        self.default_ttl = app.config.get('CACHE_DEFAULT_TTL', 300)
+        app.extensions['cache'] = self
+
+    def make_key(self, key):
+        return f'{self.prefix}{key}'
+
+    def _ttl(self, ttl):
+        return self.default_ttl if ttl is None else ttl
+
+    def get(self, key, default=None):
+        try:
+            return self.backend.get(self.make_key(key), default)
+        except CacheDecodeError as error:
+            # Stale or corrupt: drop it so the caller recomputes and stores a fresh one
+            logger.warning('Discarding cache entry %r: %s', key, error)
+            self.delete(key)
+            return default
+        except CacheError as error:
+            logger.warning('Cache get failed: %s', error)
+            return default
+
+    def set(self, key, value, ttl=None):
+        try:
+            return self.backend.set(self.make_key(key), value, self._ttl(ttl))
+        except CacheError as error:
+            logger.warning('Cache set failed: %s', error)
+            return False
+
+    def add(self, key, value, ttl=None):
+        return self.backend.add(self.make_key(key), value, self._ttl(ttl))
+
+    def delete(self, key):
+        try:
+            return self.backend.delete(self.make_key(key))
+        except CacheError as error:
+            logger.warning('Cache delete failed: %s', error)
+            return False
+
+    def delete_if_equal(self, key, value):
+        return self.backend.delete_if_equal(self.make_key(key), value)
+
+    def incr(self, key, delta=1, ttl=None):
+        return self.backend.incr(self.make_key(key), delta, self._ttl(ttl))
+
+    def versioned_key(self, namespace, key):
+        """`namespace:<version>:key`; bump_namespace moves every key of the namespace aside at once"""
+        return f"{namespace}:{self.get(f'{namespace}:version', 0)}:{key}"
+
+    def bump_namespace(self, namespace):
+        """Invalidate every versioned key of `namespace`, leaving the rest of the cache alone"""
+        try:
+            # Never expires, or the old version and its entries could come back
+            self.backend.incr(self.make_key(f'{namespace}:version'), 1, 0)
+        except CacheError as error:
+            logger.warning('Cache namespace bump failed: %s', error)
+
+    def lock(self, name, timeout=10, blocking_timeout=None):
+        """`with cache.lock('name'):` runs the block in at most one worker at a time"""
+        return CacheLock(self, name, timeout, blocking_timeout)
+
+    def clear(self):
+        """Drop every entry; on Redis only this app's prefixed keys"""
+        if isinstance(self.backend, RedisBackend):
+            self.backend.clear(self.make_key('*'))
+        else:
+            self.backend.clear()
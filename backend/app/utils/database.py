@@ -1,5 +1,89 @@
 from app import db
+from flask import current_app, has_request_context, request
+from sqlalchemy import event, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Requests that never write, so their transactions need no write lock
+READ_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
 
 def init_db(app):
     with app.app_context():
-        db.create_all()
\ No newline at end of file
+        db.create_all()
+
+def ensure_row(model, values):
+    """Insert a row unless one with the same primary key exists, tolerating concurrent inserts"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        statement = postgresql.insert(model).values(**values).on_conflict_do_nothing()
+    elif dialect == 'sqlite':
+        statement = sqlite.insert(model).values(**values).on_conflict_do_nothing()
+    else:
+        key = [values[column.key] for column in model.__table__.primary_key]
+        if db.session.get(model, tuple(key)):
+            return
+        statement = model.__table__.insert().values(**values)
+
+    db.session.execute(statement)
+
+def increment(model, key, **deltas):
+    """Add deltas to the counters of the row at `key`, creating it at zero first"""
+    ensure_row(model, {**key, **{column: 0 for column in deltas}})
+
+    db.session.execute(
+        update(model)
+        .where(*[getattr(model, column) == value for column, value in key.items()])
+        .values({column: getattr(model, column) + delta for column, delta in deltas.items()})
+    )
+
+def dispose_after_fork(app):
+    """Forget the connections a forked worker inherited, leaving them open for the parent"""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+def read_only(view):
+    """Mark a view that reads but answers a POST, so its transaction starts without the write lock"""
+    view.read_only = True
+    return view
+
+def _writes():
+    # The request may write: not a safe method, and not a view marked read_only
+    if not has_request_context() or request.method in READ_METHODS:
+        return False
+    view = current_app.view_functions.get(request.endpoint)
+    return not getattr(view, 'read_only', False)
+
+def configure_sqlite(engine, config):
+    """Apply the SQLite pragmas from config to every new connection, and take the write lock up front
+
+    pysqlite's own transaction handling is turned off so SQLAlchemy emits BEGIN
+    itself: BEGIN IMMEDIATE in requests that write, so two writers queue on
+    busy_timeout instead of one failing to upgrade its read lock, and a plain
+    BEGIN everywhere else.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = [
+        ('journal_mode', config.get('SQLITE_JOURNAL_MODE')),
+        ('synchronous', config.get('SQLITE_SYNCHRONOUS')),
+        ('cache_size', config.get('SQLITE_CACHE_SIZE')),
+        ('mmap_size', config.get('SQLITE_MMAP_SIZE')),
+        ('busy_timeout', config.get('SQLITE_BUSY_TIMEOUT')),
+        ('foreign_keys', 'ON' if config.get('SQLITE_FOREIGN_KEYS') else 'OFF')
+    ]
+    immediate = config.get('SQLITE_IMMEDIATE_WRITES', True)
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            if value is not None:
+                cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    @event.listens_for(engine, 'begin')
+    def begin(conn):
+        # On the driver connection, so the statement stays out of the per-request SQL counts
+        conn.connection.driver_connection.execute('BEGIN IMMEDIATE' if immediate and _writes() else 'BEGIN')
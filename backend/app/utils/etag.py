@@ -0,0 +1,31 @@
+import hashlib
+from functools import wraps
+from flask import make_response, request
+
+def conditional(*resources, cache_control):
+    """Strong ETag and If-None-Match handling for a read endpoint built from `resources`
+
+    The tag is derived from the revisions of the resources and the request URL, so a
+    matching request is answered with 304 before the view (and the ORM) runs.
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            from app.services.revision_service import get_revisions
+
+            revisions = get_revisions(resources)
+            stamp = ';'.join(f'{resource}={revisions[resource]}' for resource in resources)
+            digest = hashlib.sha1(f'{stamp}|{request.full_path}'.encode()).hexdigest()[:20]
+
+            if request.if_none_match.contains(digest):
+                response = make_response('', 304)
+            else:
+                response = make_response(fn(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(digest)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return decorator
+    return wrapper
@@ -0,0 +1,92 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from passlib.hash import pbkdf2_sha256
+
+DEFAULT_ROUNDS = pbkdf2_sha256.default_rounds
+
+class HashingOverloaded(Exception):
+    """Raised when too many hashing jobs are already queued"""
+
+def _hash(password, rounds):
+    return pbkdf2_sha256.using(rounds=rounds).hash(password)
+
+def _verify(password, password_hash):
+    return pbkdf2_sha256.verify(password, password_hash)
+
+class PasswordHasher:
+    """Runs pbkdf2 hashing on a bounded process pool so it never blocks request threads"""
+
+    def __init__(self, app=None):
+        self.rounds = DEFAULT_ROUNDS
+        self.workers = 0
+        self.max_queue = 0
+        self.timeout = None
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get('PASSWORD_HASH_ROUNDS', DEFAULT_ROUNDS)
+        # 0 workers hashes inline, which is what tests and one-off scripts want
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1)
+        self.max_queue = app.config.get('PASSWORD_HASH_MAX_QUEUE', self.workers * 4)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        self.shutdown()
+
+    def hash(self, password):
+        return self._run(_hash, password, self.rounds)
+
+    def verify(self, password, password_hash):
+        return self._run(_verify, password, password_hash)
+
+    def needs_update(self, password_hash):
+        """True when a stored hash was made with a different rounds setting"""
+        return pbkdf2_sha256.using(rounds=self.rounds).needs_update(password_hash)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._slots = None
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                # Spawned workers do not inherit the request threads' locks or connections
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._slots = threading.BoundedSemaphore(self.max_queue)
+            return self._pool, self._slots
+
+    def _run(self, fn, *args):
+        if not self.workers:
+            return fn(*args)
+
+        pool, slots = self._executor()
+
+        # Shed load instead of letting requests pile up behind the pool
+        if not slots.acquire(blocking=False):
+            raise HashingOverloaded('Too many password operations in progress, try again shortly')
+
+        try:
+            future = pool.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise HashingOverloaded('Password operation timed out, try again shortly')
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,147 @@
+"""Request and SQL instrumentation, rendered in the Prometheus text format.
+
+Request hooks time every request per endpoint, and engine events count the SQL
+statements each request runs and how long they take. Everything is kept per
+worker process, so scrape each worker (or sum them) the way Prometheus expects
+from any multi-process server.
+"""
+import threading
+import time
+from flask import g, has_app_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SQL_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+def _labels(names, values, **extra):
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(self.labels, labels)} {_number(value)}')
+        return lines
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # labels -> ([count per bucket..., +Inf], sum)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        with self._lock:
+            counts, total = self._values.get(labels) or ([0] * (len(self.buckets) + 1), 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            counts[-1] += 1
+            self._values[labels] = (counts, total + value)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for labels, (counts, total) in sorted(self._values.items()):
+                for bound, count in zip(self.buckets + ('+Inf',), counts):
+                    lines.append(f'{self.name}_bucket{_labels(self.labels, labels, le=bound)} {count}')
+                lines.append(f'{self.name}_sum{_labels(self.labels, labels)} {_number(total)}')
+                lines.append(f'{self.name}_count{_labels(self.labels, labels)} {counts[-1]}')
+        return lines
+
+class Metrics:
+    """Flask extension recording latency and SQL usage per endpoint"""
+
+    def __init__(self):
+        self.server_timing = False
+        self.requests = Counter(
+            'http_requests_total', 'Requests handled, by endpoint, method and status',
+            ('endpoint', 'method', 'status')
+        )
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Request latency by endpoint',
+            ('endpoint', 'method'), LATENCY_BUCKETS
+        )
+        self.statements = Histogram(
+            'db_statements_per_request', 'SQL statements executed per request, by endpoint',
+            ('endpoint',), STATEMENT_BUCKETS
+        )
+        self.sql_time = Histogram(
+            'db_time_per_request_seconds', 'Time spent in SQL per request, by endpoint',
+            ('endpoint',), SQL_TIME_BUCKETS
+        )
+
+    def init_app(self, app, engine):
+        self.server_timing = app.config.get('METRICS_SERVER_TIMING', False)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        event.listen(engine, 'before_cursor_execute', self._before_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_execute)
+
+    def render(self, *extra):
+        """Text exposition of every metric, followed by any `extra` Counter or Histogram"""
+        lines = []
+        for metric in (self.requests, self.latency, self.statements, self.sql_time, *extra):
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def _start(self):
+        g.metrics_started = time.perf_counter()
+        g.sql_statements = 0
+        g.sql_time = 0.0
+
+    def _finish(self, response):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return response
+
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'unmatched'
+        self.requests.inc(endpoint, request.method, response.status_code)
+        self.latency.observe(elapsed, endpoint, request.method)
+        self.statements.observe(g.sql_statements, endpoint)
+        self.sql_time.observe(g.sql_time, endpoint)
+
+        if self.server_timing:
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={g.sql_time * 1000:.1f};desc="{g.sql_statements} queries", app;dur={elapsed * 1000:.1f}'
+            )
+        return response
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # Statements run outside a request (startup, CLI commands) are not attributed.
+        # The start lives on the statement's own context, so one that fails leaves nothing behind
+        if context is not None and has_app_context() and 'metrics_started' in g:
+            context._metrics_started = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_metrics_started', None)
+        if started is not None and has_app_context() and 'metrics_started' in g:
+            g.sql_statements += 1
+            g.sql_time += time.perf_counter() - started
+
+metrics = Metrics()
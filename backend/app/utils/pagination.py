@@ -0,0 +1,95 @@
+import base64
+from bisect import bisect_right
+import json
+from datetime import date, datetime, time
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def get_page_args(args):
+    """Read `cursor` and `limit` from the query string; returns (cursor, limit, error)"""
+    cursor = args.get('cursor') or None
+    limit = args.get('limit')
+
+    if limit is None:
+        return cursor, (DEFAULT_PAGE_SIZE if cursor else None), None
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        return None, None, 'Limit must be an integer'
+
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return None, None, f'Limit must be between 1 and {MAX_PAGE_SIZE}'
+
+    return cursor, limit, None
+
+def _encode_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+def _decode_value(column, value):
+    python_type = column.type.python_type
+    if value is None:
+        return None
+    if python_type in (datetime, date, time):
+        return python_type.fromisoformat(value)
+    return python_type(value)
+
+def encode_cursor(values):
+    payload = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, columns):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def _after(columns, values, descending):
+    """Row-value comparison (a, b) > (x, y) spelled out for every backend"""
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, beyond))
+    return or_(*clauses)
+
+def paginate(query, columns, cursor=None, limit=None, descending=True):
+    """Keyset-paginate a query ordered by `columns` (last one unique); returns (items, next_cursor)"""
+    query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns), descending))
+
+    if limit is None:
+        return query.all(), None
+
+    # Fetch one extra row to know whether another page exists
+    items = query.limit(limit + 1).all()
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor([getattr(last, column.key) for column in columns])
+
+def paginate_sorted(items, columns, cursor=None, limit=None):
+    """Keyset-paginate records already sorted ascending by `columns`, with the same cursors as paginate"""
+    keys = [column.key for column in columns]
+    key_of = lambda item: tuple(getattr(item, key) for key in keys)
+
+    if cursor:
+        items = items[bisect_right(items, tuple(decode_cursor(cursor, columns)), key=key_of):]
+
+    if limit is None or len(items) <= limit:
+        return list(items), None
+
+    items = list(items[:limit])
+    return items, encode_cursor(key_of(items[-1]))
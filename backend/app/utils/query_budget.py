@@ -0,0 +1,121 @@
+"""Query budgets for development and tests.
+
+Each request may run at most its budget of SQL statements, and no single
+statement shape more than QUERY_REPEAT_LIMIT times (the signature of an N+1).
+Budgets come from QUERY_BUDGETS, keyed by endpoint ('bookings.list_bookings')
+or blueprint ('bookings'), falling back to QUERY_BUDGET_DEFAULT.
+
+A request over budget is reported with the application lines that issued the
+statements. QUERY_BUDGET_MODE picks what happens: 'raise' (the default under
+TESTING), 'log' (the default under DEBUG) or 'off' (the default otherwise).
+"""
+import os
+import re
+import traceback
+from collections import Counter
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Callers shown per statement shape in a report
+MAX_CALLERS = 3
+
+class QueryBudgetExceeded(Exception):
+    """Raised in 'raise' mode when a request exceeds its query budget"""
+
+def parse_budgets(value):
+    """Read 'bookings=10,avenues.list_avenues=2' into a dict"""
+    budgets = {}
+    for item in filter(None, (part.strip() for part in (value or '').split(','))):
+        name, _, budget = item.partition('=')
+        budgets[name.strip()] = int(budget)
+    return budgets
+
+def statement_shape(statement):
+    """Collapse whitespace and expanded IN lists so repeats of one query compare equal"""
+    shape = re.sub(r'\s+', ' ', statement).strip()
+    return re.sub(r'\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)', '(?)', shape)
+
+def _caller():
+    # Innermost application frames, skipping this module
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if frame.filename.startswith(APP_ROOT) and frame.filename != __file__
+    ]
+    return tuple(f'{os.path.relpath(f.filename, APP_ROOT)}:{f.lineno} in {f.name}' for f in frames[-2:])
+
+class QueryBudget:
+    """Flask extension counting each request's statements against its budget"""
+
+    def init_app(self, app, engine):
+        app.before_request(self._start)
+        app.after_request(self._check)
+        event.listen(engine, 'before_cursor_execute', self._record)
+
+    def _mode(self):
+        config = current_app.config
+        mode = config.get('QUERY_BUDGET_MODE')
+        if mode:
+            return mode
+        if current_app.testing:
+            return 'raise'
+        return 'log' if current_app.debug else 'off'
+
+    def budget_for(self, endpoint):
+        config = current_app.config
+        budgets = config.get('QUERY_BUDGETS', {})
+        blueprint = endpoint.rpartition('.')[0] if endpoint else None
+        for name in (endpoint, blueprint):
+            if name in budgets:
+                return budgets[name]
+        return config.get('QUERY_BUDGET_DEFAULT', 20)
+
+    def _start(self):
+        if self._mode() != 'off':
+            g.query_shapes = Counter()
+            g.query_callers = {}
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if not has_app_context() or 'query_shapes' not in g:
+            return
+
+        shape = statement_shape(statement)
+        g.query_shapes[shape] += 1
+        callers = g.query_callers.setdefault(shape, Counter())
+        caller = _caller()
+        if caller in callers or len(callers) < MAX_CALLERS:
+            callers[caller] += 1
+
+    def _check(self, response):
+        shapes = g.pop('query_shapes', None)
+        if shapes is None:
+            return response
+
+        callers = g.pop('query_callers')
+        total = sum(shapes.values())
+        budget = self.budget_for(request.endpoint)
+        repeat_limit = current_app.config.get('QUERY_REPEAT_LIMIT', 5)
+        if total <= budget and max(shapes.values(), default=0) <= repeat_limit:
+            return response
+
+        report = self.report(request.endpoint, total, budget, repeat_limit, shapes, callers)
+        if self._mode() == 'raise':
+            raise QueryBudgetExceeded(report)
+        current_app.logger.warning(report)
+        return response
+
+    @staticmethod
+    def report(endpoint, total, budget, repeat_limit, shapes, callers):
+        lines = [f'{request.method} {request.path} ({endpoint}) ran {total} SQL statements']
+        if total > budget:
+            lines[0] += f', over its budget of {budget}'
+
+        for shape, count in shapes.most_common():
+            flag = f'  <- repeated more than {repeat_limit} times' if count > repeat_limit else ''
+            lines.append(f'  {count} x {shape[:200]}{flag}')
+            for caller, calls in callers[shape].most_common(MAX_CALLERS):
+                lines.append(f"      {calls} x from {' -> '.join(caller) or '(outside the app)'}")
+        return '\n'.join(lines)
+
+query_budget = QueryBudget()
@@ -2,7 +2,11 @@ import re
 from flask_jwt_extended import create_access_token, get_jwt_identity
 from functools import wraps
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
-from flask import jsonify
+from flask import g, jsonify
+from collections import namedtuple
+from app import cache, db
+from app.services.invalidation_service import USERS, bus
+from sqlalchemy.orm import make_transient_to_detached
 
 def admin_required():
     def wrapper(fn):
@@ -24,16 +28,68 @@ def create_access_token_for_user(user):
     }
     return create_access_token(identity=user.username, additional_claims=additional_claims)
 
+# Identity of the caller, built from the JWT claims without touching the database
+Identity = namedtuple('Identity', ['id', 'username', 'role', 'email'])
+
+# Full User rows for handlers that need more than the claims
+USER_CACHE_TTL = 300
+# Never written to the cache; loaded from the row when a handler reads it
+UNCACHED_USER_COLUMNS = frozenset(('password_hash',))
+
+def _user_key(user_id):
+    return cache.versioned_key('user', user_id)
+
+def get_current_identity():
+    if 'identity' not in g:
+        claims = get_jwt()
+        username = get_jwt_identity()
+        user_id = claims.get('user_id')
+
+        if user_id is None:
+            # Tokens issued without claims (e.g. refresh tokens) only carry the username
+            from app.models import User
+            user = User.query.filter_by(username=username).first()
+            g.identity = Identity(user.id, user.username, user.role.value, user.email) if user else None
+        else:
+            g.identity = Identity(user_id, username, claims.get('role'), claims.get('email'))
+
+    return g.identity
+
 def get_current_user():
     from app.models import User
-    username = get_jwt_identity()
-    return User.query.filter_by(username=username).first()
+    identity = get_current_identity()
+    if not identity:
+        return None
+
+    # Column values are cached rather than the instance, which belongs to another session
+    values = cache.get(_user_key(identity.id))
+    if values is None:
+        user = db.session.get(User, identity.id)
+        if user:
+            values = {c.key: getattr(user, c.key) for c in User.__table__.columns if c.key not in UNCACHED_USER_COLUMNS}
+            cache.set(_user_key(identity.id), values, USER_CACHE_TTL)
+        return user
+
+    user = User(**values)
+    make_transient_to_detached(user)
+    # Attach to this request's session without reloading the row
+    return db.session.merge(user, load=False)
 
 def get_current_user_id():
-    from app.models import User
-    username = get_jwt_identity()
-    user = User.query.filter_by(username=username).first()
-    return user.id
+    identity = get_current_identity()
+    return identity.id if identity else None
+
+def invalidate_cached_user(user_id):
+    cache.delete(_user_key(user_id))
+
+def _drop_cached_user(user_id):
+    # Changed by another worker; no id means any user may have changed
+    if user_id is None:
+        cache.bump_namespace('user')
+    else:
+        cache.delete(_user_key(user_id))
+
+bus.subscribe(USERS, _drop_cached_user)
 
 def validate_registration_data(data):
     errors = {}
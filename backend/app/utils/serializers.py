@@ -0,0 +1,316 @@
+"""Response encoders shared by every route.
+
+Each encoder is described once as a mapping of response keys to Python
+expressions over `obj` and compiled into a single function at import time,
+so encoding a row is one dict literal with no per-field dispatch.
+"""
+from flask.json.provider import DefaultJSONProvider, _default
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+AVATAR_URL = "https://boring-avatars-api.vercel.app/api/avatar?size=40&variant=beam&name={}"
+
+def _source(spec, indent='    '):
+    if isinstance(spec, str):
+        return spec
+    inner = indent + '    '
+    items = ',\n'.join(f"{inner}{key!r}: {_source(value, inner)}" for key, value in spec.items())
+    return '{\n' + items + '\n' + indent + '}'
+
+def compile_encoder(name, spec, **encoders):
+    """Compile a {key: expression} spec into `name(obj)`; nested encoders are passed by keyword"""
+    source = f"def {name}(obj):\n    return {_source(spec)}\n"
+    namespace = {'AVATAR_URL': AVATAR_URL, **encoders}
+    exec(compile(source, f'<encoder {name}>', 'exec'), namespace)
+    return namespace[name]
+
+DESTINATION = {
+    'id': 'obj.id',
+    'name': 'obj.name',
+    'modes': {
+        'air': 'obj.air',
+        'coach': 'obj.coach',
+        'train': 'obj.train'
+    },
+    'status': 'obj.status.value',
+    'created_at': 'obj.created_at.isoformat()'
+}
+
+USER = {
+    'id': 'obj.id',
+    'username': 'obj.username',
+    'email': 'obj.email',
+    'role': 'obj.role.value',
+    'avatar': 'AVATAR_URL.format(obj.username)',
+    'created_at': 'obj.created_at'
+}
+
+USER_SUMMARY = {
+    'id': 'obj.id',
+    'username': 'obj.username',
+    'email': 'obj.email',
+    'role': 'obj.role.value'
+}
+
+TRANSACTION = {
+    'id': 'obj.id',
+    'identifier': 'obj.identifier',
+    'amount': 'obj.amount',
+    'status': 'obj.status.value',
+    'payment_method': 'obj.payment_method.value',
+    'type': 'obj.type.value',
+    'created_at': 'obj.created_at.isoformat()'
+}
+
+BOOKING = {
+    'id': 'obj.id',
+    'identifier': 'obj.identifier',
+    'status': 'obj.status.value',
+    'date': 'obj.date.isoformat()',
+    'mode': 'obj.mode.value',
+    'type': 'obj.type.value',
+    'seat': 'obj.seat',
+    'price': 'obj.price',
+    'ticket': 'obj.ticket.value',
+    'created_at': 'obj.created_at.isoformat()',
+    'updated_at': 'obj.updated_at.isoformat()'
+}
+
+# Avenue as embedded in a booking, with both destinations in full
+BOOKING_AVENUE = {
+    'id': 'obj.id',
+    'leave_time': 'obj.leave_time.isoformat()',
+    'arrive_time': 'obj.arrive_time.isoformat()',
+    'price': 'obj.price',
+    'leave_destination': 'encode_destination(obj.leave_destination)',
+    'arrive_destination': 'encode_destination(obj.arrive_destination)'
+}
+
+# Avenue as returned right after booking it, with destination names only
+BOOKING_ROUTE = {
+    'id': 'obj.id',
+    'from': 'obj.leave_destination.name',
+    'to': 'obj.arrive_destination.name',
+    'leave_time': 'obj.leave_time.isoformat()',
+    'arrive_time': 'obj.arrive_time.isoformat()',
+    'price': 'obj.price'
+}
+
+AVENUE = {
+    'id': 'obj.id',
+    'leave_destination': 'encode_destination(obj.leave_destination)',
+    'arrive_destination': 'encode_destination(obj.arrive_destination)',
+    'leave_time': 'obj.leave_time.isoformat()',
+    'arrive_time': 'obj.arrive_time.isoformat()',
+    'price': {
+        'air': '0 if not obj.leave_destination.air or not obj.arrive_destination.air else obj.price',
+        'coach': '0 if not obj.leave_destination.coach or not obj.arrive_destination.coach else obj.price / (1/3)',
+        'train': '0 if not obj.leave_destination.train or not obj.arrive_destination.train else obj.price * 3'
+    },
+    'status': 'obj.status.value',
+    'created_at': 'obj.created_at.isoformat()'
+}
+
+AVENUE_LISTING = {
+    **AVENUE,
+    'seats': {
+        'air': '140',
+        'coach': '50',
+        'train': '240'
+    }
+}
+
+# One result of an availability search: the avenue in a given travel mode
+AVAILABLE_AVENUE = {
+    'id': "obj['avenue'].id",
+    'leave_destination': "encode_destination(obj['avenue'].leave_destination)",
+    'arrive_destination': "encode_destination(obj['avenue'].arrive_destination)",
+    'leave_time': "obj['avenue'].leave_time.isoformat()",
+    'arrive_time': "obj['avenue'].arrive_time.isoformat()",
+    'travel_mode': "obj['mode'].value",
+    'prices': "obj['prices']",
+    'seat_availability': "obj['seat_availability']",
+    'discount': "obj['discount']",
+    'max_seats': "obj['max_seats']",
+    'booked_seats': "obj['booked_seats']"
+}
+
+encode_destination = compile_encoder('encode_destination', DESTINATION)
+encode_user = compile_encoder('encode_user', USER)
+encode_user_summary = compile_encoder('encode_user_summary', USER_SUMMARY)
+encode_transaction = compile_encoder('encode_transaction', TRANSACTION)
+
+encode_avenue = compile_encoder('encode_avenue', AVENUE, encode_destination=encode_destination)
+encode_avenue_listing = compile_encoder('encode_avenue_listing', AVENUE_LISTING, encode_destination=encode_destination)
+encode_available_avenue = compile_encoder('encode_available_avenue', AVAILABLE_AVENUE, encode_destination=encode_destination)
+
+encode_booking_avenue = compile_encoder('encode_booking_avenue', BOOKING_AVENUE, encode_destination=encode_destination)
+encode_booking_route = compile_encoder('encode_booking_route', BOOKING_ROUTE)
+
+NESTED = {
+    'encode_user_summary': encode_user_summary,
+    'encode_booking_avenue': encode_booking_avenue,
+    'encode_booking_route': encode_booking_route,
+    'encode_transaction': encode_transaction
+}
+
+# Relationships a booking listing embeds unless the client narrows `include`
+BOOKING_RELATIONS = {
+    'user': 'encode_user_summary(obj.user)',
+    'avenue': 'encode_booking_avenue(obj.avenue)',
+    'transactions': '[encode_transaction(t) for t in obj.transactions]'
+}
+
+# In the normalized shape shared entities are referenced by id instead of embedded
+BOOKING_REFERENCES = {
+    'user': ('user_id', 'obj.user.id'),
+    'avenue': ('avenue_id', 'obj.avenue.id')
+}
+
+@lru_cache(maxsize=64)
+def booking_encoder(fields=tuple(BOOKING), include=tuple(BOOKING_RELATIONS), normalized=False):
+    """Encoder for a sparse fieldset, compiled on first use and then reused"""
+    spec = {key: BOOKING[key] for key in fields}
+    for key in include:
+        if normalized and key in BOOKING_REFERENCES:
+            reference, expression = BOOKING_REFERENCES[key]
+            spec[reference] = expression
+        else:
+            spec[key] = BOOKING_RELATIONS[key]
+    return compile_encoder('encode_booking', spec, **NESTED)
+
+encode_booking = booking_encoder()
+
+encode_created_booking = compile_encoder('encode_created_booking', {
+    **BOOKING,
+    'user': 'encode_user_summary(obj.user)',
+    'avenue': 'encode_booking_route(obj.avenue)',
+    'transactions': '[encode_transaction(t) for t in obj.transactions]'
+}, **NESTED)
+
+encode_transaction_booking = compile_encoder('encode_transaction_booking', {
+    **BOOKING,
+    'user': 'encode_user_summary(obj.user)',
+    'avenue': 'encode_booking_avenue(obj.avenue)'
+}, **NESTED)
+
+encode_transaction_listing = compile_encoder('encode_transaction_listing', {
+    **TRANSACTION,
+    'booking_id': 'obj.booking_id',
+    'booking': 'encode_transaction_booking(obj.booking)'
+}, encode_transaction_booking=encode_transaction_booking)
+
+encode_avenue_reference = compile_encoder('encode_avenue_reference', {
+    **{key: value for key, value in AVENUE_LISTING.items() if key not in ('leave_destination', 'arrive_destination')},
+    'leave_destination_id': 'obj.leave_destination_id',
+    'arrive_destination_id': 'obj.arrive_destination_id'
+})
+
+encode_booking_avenue_reference = compile_encoder('encode_booking_avenue_reference', {
+    **{key: value for key, value in BOOKING_AVENUE.items() if key not in ('leave_destination', 'arrive_destination')},
+    'leave_destination_id': 'obj.leave_destination_id',
+    'arrive_destination_id': 'obj.arrive_destination_id'
+})
+
+class Included:
+    """Entities referenced by the rows of a normalized response, each encoded once"""
+
+    def __init__(self):
+        self.entities = {}
+
+    def add(self, kind, obj, encoder):
+        bucket = self.entities.setdefault(kind, {})
+        if obj.id not in bucket:
+            bucket[obj.id] = encoder(obj)
+
+    def add_avenue(self, avenue, encoder):
+        self.add('avenues', avenue, encoder)
+        self.add('destinations', avenue.leave_destination, encode_destination)
+        self.add('destinations', avenue.arrive_destination, encode_destination)
+
+def normalize_avenues(avenues):
+    """Avenue rows referencing their destinations; returns (rows, included)"""
+    included = Included()
+    rows = []
+    for avenue in avenues:
+        rows.append(encode_avenue_reference(avenue))
+        included.add('destinations', avenue.leave_destination, encode_destination)
+        included.add('destinations', avenue.arrive_destination, encode_destination)
+    return rows, included.entities
+
+def normalize_bookings(bookings, fields=tuple(BOOKING), include=tuple(BOOKING_RELATIONS)):
+    """Booking rows referencing their user and avenue; returns (rows, included)"""
+    encode = booking_encoder(fields, include, normalized=True)
+    included = Included()
+    rows = []
+    for booking in bookings:
+        rows.append(encode(booking))
+        if 'user' in include:
+            included.add('users', booking.user, encode_user_summary)
+        if 'avenue' in include:
+            included.add_avenue(booking.avenue, encode_booking_avenue_reference)
+    return rows, included.entities
+
+def get_format_arg(args):
+    """Read `format` (nested or normalized) from the query string; returns (normalized, error)"""
+    value = args.get('format', 'nested')
+    if value not in ('nested', 'normalized'):
+        return None, 'Format must be one of: nested, normalized'
+    return value == 'normalized', None
+
+def _parse_list(value, allowed, name):
+    requested = {item.strip() for item in value.split(',') if item.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        return None, f"Unknown {name}: {', '.join(sorted(unknown))}. Must be among: {', '.join(allowed)}"
+    # Canonical order so equal selections share one compiled encoder
+    return tuple(item for item in allowed if item in requested), None
+
+def get_fieldset_args(args, fields, relations):
+    """Read `fields` and `include` from the query string; returns (fields, include, error)
+
+    Both default to everything, and `id` is always part of the fieldset.
+    """
+    selected, include = tuple(fields), tuple(relations)
+
+    if args.get('fields') is not None:
+        selected, error = _parse_list(args['fields'] + ',id', fields, 'fields')
+        if error:
+            return None, None, error
+
+    if args.get('include') is not None:
+        include, error = _parse_list(args['include'], relations, 'include')
+        if error:
+            return None, None, error
+
+    return selected, include, None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson
+
+    Keys, separators and dates come out as with the default provider, but
+    non-ASCII text is written as raw UTF-8 where the default provider (with
+    ensure_ascii) escapes it as \\uXXXX. Both are the same JSON to a parser, not
+    the same bytes on the wire.
+    """
+
+    # Dates go through Flask's default hook so they keep their HTTP date format
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        options = self.options
+        if kwargs.get('indent'):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=options).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+def init_json(app):
+    """Use orjson for responses when JSON_BACKEND=orjson and it is installed"""
+    if orjson is not None and app.config.get('JSON_BACKEND', 'default') == 'orjson':
+        app.json = OrjsonProvider(app)
@@ -1,5 +1,5 @@
 from datetime import datetime, time
-from app.models import BookingStatus, ContactStatus, GlobalStatus, SeatClass, TransactionStatus, TravelMode
+from app.models import BookingStatus, ContactStatus, GlobalStatus, PaymentMethod, SeatClass, TransactionStatus, TravelMode
 
 def validate_admin_password_update(data):
     errors = {}
@@ -228,6 +228,14 @@ def validate_booking_data(data):
     elif not isinstance(data['price'], (int, float)) or data['price'] <= 0:
         errors['price'] = 'Price must be a positive number'
     
+    if not data.get('payment'):
+        errors['payment'] = 'Payment method is required'
+    else:
+        try:
+            PaymentMethod(data['payment'])
+        except ValueError:
+            errors['payment'] = f"Invalid payment method. Must be one of: {[p.value for p in PaymentMethod]}"
+    
     return errors
 
 def validate_booking_status(data):
@@ -0,0 +1,40 @@
+"""Gunicorn settings for serving wsgi:app; every value can be overridden from the environment.
+
+The app is loaded once in the master (timetable included) and then frozen out
+of the garbage collector, so forked workers keep sharing those pages
+copy-on-write instead of touching them on their first collection.
+"""
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread' if threads > 1 else 'sync'
+
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+
+# Recycle workers now and then, staggered so they do not all restart together
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', max_requests // 10))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')
+
+def when_ready(server):
+    # Runs in the master after the preloaded app is imported and before any worker forks
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+
+def post_fork(server, worker):
+    # Pooled connections opened while preloading belong to the master; each worker opens its own
+    if preload_app:
+        from app.utils.database import dispose_after_fork
+        from wsgi import app
+
+        dispose_after_fork(app)
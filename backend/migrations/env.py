@@ -97,6 +97,12 @@ def run_migrations_online():
     connectable = get_engine()
 
     with connectable.connect() as connection:
+        # Batch migrations rebuild SQLite tables, which foreign key enforcement would
+        # refuse; the pragma only takes effect outside a transaction
+        sqlite = connection.dialect.name == 'sqlite'
+        if sqlite:
+            connection.connection.driver_connection.execute('PRAGMA foreign_keys=OFF')
+
         context.configure(
             connection=connection,
             target_metadata=get_metadata(),
@@ -106,6 +112,9 @@ def run_migrations_online():
         with context.begin_transaction():
             context.run_migrations()
 
+        if sqlite and current_app.config.get('SQLITE_FOREIGN_KEYS'):
+            connection.connection.driver_connection.execute('PRAGMA foreign_keys=ON')
+
 
 if context.is_offline_mode():
     run_migrations_offline()
@@ -0,0 +1,64 @@
+"""Measure how many logins per second per core password verification allows.
+
+Run from the backend directory:
+
+    python scripts/bench_password_hashing.py [--rounds N] [--workers N] [--logins N]
+
+Verifies the same hash inline and then through the hashing pool, and reports
+logins per second overall and per core for each.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from flask import Flask
+from app.utils.hashing import DEFAULT_ROUNDS, PasswordHasher
+
+def run(hasher, password_hash, logins, concurrency):
+    def login(_):
+        return hasher.verify('benchmark-password', password_hash)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        results = list(threads.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    assert all(results)
+    return logins / elapsed
+
+def make_hasher(rounds, workers):
+    app = Flask(__name__)
+    app.config['PASSWORD_HASH_ROUNDS'] = rounds
+    app.config['PASSWORD_HASH_WORKERS'] = workers
+    # Never shed load here, the benchmark wants raw throughput
+    app.config['PASSWORD_HASH_MAX_QUEUE'] = max(workers, 1) * 1000
+    app.config['PASSWORD_HASH_TIMEOUT'] = None
+    return PasswordHasher(app)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=int(os.getenv('PASSWORD_HASH_ROUNDS', DEFAULT_ROUNDS)))
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--logins', type=int, default=200)
+    args = parser.parse_args()
+
+    inline = make_hasher(args.rounds, 0)
+    password_hash = inline.hash('benchmark-password')
+
+    print(f"pbkdf2_sha256 with {args.rounds} rounds, {args.logins} logins")
+
+    rate = run(inline, password_hash, args.logins, 1)
+    print(f"  inline:            {rate:8.1f} logins/s  {rate:8.1f} per core")
+
+    pooled = make_hasher(args.rounds, args.workers)
+    pooled.verify('benchmark-password', password_hash)  # start the workers
+    rate = run(pooled, password_hash, args.logins, args.workers * 2)
+    pooled.shutdown()
+    print(f"  pool ({args.workers} workers): {rate:8.1f} logins/s  {rate / args.workers:8.1f} per core")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Measure SQLite read throughput while bookings are being written, per connection profile.
+
+Run from the backend directory, ideally against a seeded database:
+
+    python scripts/bench_sqlite_concurrency.py [--database instance/app.db] \\
+        [--duration 10] [--readers 4] [--writers 2] [--profiles stock,tuned]
+
+Each profile runs on its own copy of the database, in a fresh process with its
+SQLITE_* settings. Readers list a member's bookings and search availability;
+writers create bookings through the booking service as the create endpoint
+would. Reads are measured alone and then during the write storm, and the report
+shows reads per second, read latency, bookings per second and failed writes.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# SQLite's own defaults (rollback journal, full sync, 2 MiB cache, deferred writes)
+# against the profile the app applies
+PROFILES = {
+    'stock': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_CACHE_SIZE': '-2000',
+        'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_BUSY_TIMEOUT': '5000',
+        'SQLITE_FOREIGN_KEYS': 'false',
+        'SQLITE_IMMEDIATE_WRITES': 'false'
+    },
+    'tuned': {}
+}
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return round(ordered[min(index, len(ordered) - 1)] * 1000, 2)
+
+class Phase:
+    def __init__(self):
+        self.reads = []
+        self.writes = []
+        self.write_errors = {}
+        self.lock = threading.Lock()
+
+    def summary(self, elapsed):
+        reads, writes = sorted(self.reads), sorted(self.writes)
+        return {
+            'reads_per_s': round(len(reads) / elapsed, 1),
+            'read_ms': {'p50': percentile(reads, 0.50), 'p95': percentile(reads, 0.95), 'p99': percentile(reads, 0.99)},
+            'bookings_per_s': round(len(writes) / elapsed, 1),
+            'write_ms': {'p50': percentile(writes, 0.50), 'p95': percentile(writes, 0.95), 'p99': percentile(writes, 0.99)},
+            'write_errors': self.write_errors
+        }
+
+def run_profile(args):
+    """Child process: run both phases against DATABASE_URL and print the report as JSON"""
+    from app import create_app
+    from app.models import Avenue, GlobalStatus, SeatClass, TravelMode, User, UserRole
+    from app.services.avenue_service import get_available_avenues
+    from app.services.booking_service import create_booking, get_user_bookings
+
+    app = create_app()
+    with app.app_context():
+        avenues = [(a.id, a.leave_destination_id, a.price) for a in Avenue.query.filter_by(status=GlobalStatus.ACTIVE)]
+        users = [u.id for u in User.query.filter_by(role=UserRole.MEMBER).with_entities(User.id).limit(5000)]
+    if not avenues or not users:
+        raise SystemExit('The database needs active avenues and members (flask seed generate)')
+
+    today = date.today()
+    modes = [mode.value for mode in TravelMode]
+
+    def read(rng):
+        if rng.random() < 0.5:
+            get_user_bookings(rng.choice(users), include=())
+        else:
+            _, origin, _ = rng.choice(avenues)
+            journey = today + timedelta(days=rng.randint(1, 60))
+            get_available_avenues({'from': origin, 'date': journey.isoformat(), 'passenger': 1})
+
+    def write(rng):
+        avenue_id, _, price = rng.choice(avenues)
+        return create_booking({
+            'avenue_id': avenue_id, 'user_id': rng.choice(users),
+            'date': (today + timedelta(days=rng.randint(1, 60))).isoformat(),
+            'mode': rng.choice(modes), 'type': SeatClass.ECONOMY.value,
+            'seat': 1, 'price': price, 'payment': 'stripe'
+        })
+
+    def reader(phase, deadline, seed):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            with app.app_context():
+                read(rng)
+            elapsed = time.perf_counter() - started
+            with phase.lock:
+                phase.reads.append(elapsed)
+
+    def writer(phase, deadline, seed):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            # A request context, so the transaction starts the way the create endpoint's does
+            with app.test_request_context('/api/bookings/create', method='POST'):
+                _, error = write(rng)
+            elapsed = time.perf_counter() - started
+            with phase.lock:
+                if error:
+                    phase.write_errors[error] = phase.write_errors.get(error, 0) + 1
+                else:
+                    phase.writes.append(elapsed)
+
+    def measure(writers):
+        phase = Phase()
+        deadline = time.monotonic() + args.duration
+        threads = [threading.Thread(target=reader, args=(phase, deadline, args.seed + i)) for i in range(args.readers)]
+        threads += [threading.Thread(target=writer, args=(phase, deadline, args.seed + 1000 + i)) for i in range(writers)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return phase.summary(time.monotonic() - started)
+
+    print(json.dumps({'reads_only': measure(0), 'write_storm': measure(args.writers)}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--database', default=os.path.join('instance', 'app.db'), help='SQLite file to copy for each profile')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per phase')
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--profiles', default=','.join(PROFILES))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return run_profile(args)
+
+    reports = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in args.profiles.split(','):
+            path = os.path.join(directory, f'{name}.db')
+            shutil.copy(args.database, path)
+            env = dict(
+                os.environ, **PROFILES[name], DATABASE_URL=f'sqlite:///{path}',
+                QUERY_BUDGET_MODE='off', PASSWORD_HASH_WORKERS='0'
+            )
+            command = [sys.executable, os.path.abspath(__file__), '--child', '--duration', str(args.duration),
+                       '--readers', str(args.readers), '--writers', str(args.writers), '--seed', str(args.seed)]
+            output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+            reports[name] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"{'profile':8} {'phase':12} {'reads/s':>9} {'read p50':>9} {'read p99':>9} {'bookings/s':>11} {'write p99':>10}  errors")
+    for name, report in reports.items():
+        for phase, row in report.items():
+            errors = sum(row['write_errors'].values())
+            print(f"{name:8} {phase:12} {row['reads_per_s']:>9} {row['read_ms']['p50']!s:>9} {row['read_ms']['p99']!s:>9} "
+                  f"{row['bookings_per_s']:>11} {row['write_ms']['p99']!s:>10}  {errors}")
+            for error, count in row['write_errors'].items():
+                print(f'{"":22}{count} x {error[:100]}')
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""Show the query plan of every hot query and check it uses its index.
+
+Run from the backend directory:
+
+    python scripts/explain_hot_queries.py
+
+Exits with status 1 when a query no longer uses the index it was tuned for.
+"""
+import os
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sqlalchemy import func, text
+from app import create_app, db
+from app.models import Avenue, Booking, BookingStatus, GlobalStatus, SeatInventory, Transaction, TransactionStatus, TravelMode
+
+def hot_queries():
+    today = date.today()
+    since = datetime.now() - timedelta(days=7)
+
+    return [
+        (
+            'seat availability for a departure hub',
+            SeatInventory.query.filter(
+                SeatInventory.avenue_id.in_([1, 2, 3]),
+                SeatInventory.date == today
+            ),
+            # The primary key index is named differently on SQLite and PostgreSQL
+            ('sqlite_autoindex_seat_inventory_1', 'seat_inventory_pkey')
+        ),
+        (
+            'confirmed seats on one departure',
+            db.session.query(func.sum(Booking.seat)).filter(
+                Booking.avenue_id == 1,
+                Booking.date == today,
+                Booking.status == BookingStatus.CONFIRMED,
+                Booking.mode == TravelMode.COACH
+            ),
+            'ix_bookings_avenue_date_status_mode'
+        ),
+        (
+            'bookings of a user',
+            Booking.query.filter(Booking.user_id == 1).order_by(Booking.date.desc()),
+            'ix_bookings_user_date'
+        ),
+        (
+            'booking stats by status',
+            db.session.query(Booking.status, func.count(Booking.id)).filter(
+                Booking.status == BookingStatus.CONFIRMED,
+                Booking.created_at >= since
+            ).group_by(Booking.status),
+            'ix_bookings_status_created_at'
+        ),
+        (
+            'successful transaction stats',
+            db.session.query(Transaction.type, func.sum(Transaction.amount)).filter(
+                Transaction.status == TransactionStatus.SUCCESS,
+                Transaction.created_at >= since
+            ).group_by(Transaction.type),
+            'ix_transactions_status_created_at'
+        ),
+        (
+            'avenue search from a destination',
+            Avenue.query.filter(
+                Avenue.leave_destination_id == 1,
+                Avenue.status == GlobalStatus.ACTIVE
+            ),
+            'ix_avenues_leave_destination_status'
+        ),
+        (
+            'booking listing page',
+            Booking.query.order_by(Booking.created_at.desc(), Booking.id.desc()).limit(50),
+            'ix_bookings_created_at_id'
+        ),
+        (
+            'transaction listing page',
+            Transaction.query.order_by(Transaction.created_at.desc(), Transaction.id.desc()).limit(50),
+            'ix_transactions_created_at_id'
+        ),
+        (
+            'transactions of listed bookings',
+            Transaction.query.filter(Transaction.booking_id.in_([1, 2, 3])),
+            'ix_transactions_booking_id'
+        ),
+    ]
+
+def explain(query):
+    dialect = db.engine.dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect.name == 'sqlite' else 'EXPLAIN '
+    rows = db.session.execute(text(prefix + sql)).all()
+    return [str(row[-1]) for row in rows]
+
+def main():
+    app = create_app()
+    missing = 0
+
+    with app.app_context():
+        for name, query, indexes in hot_queries():
+            if isinstance(indexes, str):
+                indexes = (indexes,)
+
+            plan = explain(query)
+            used = any(index in line for index in indexes for line in plan)
+            missing += not used
+
+            print(f"{'OK     ' if used else 'MISSING'} {name} ({' / '.join(indexes)})")
+            for line in plan:
+                print(f'        {line}')
+
+    return 1 if missing else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Serve the handful of Redis commands the cache uses, for trying CACHE_BACKEND=redis locally.
+
+Run from the backend directory:
+
+    python scripts/fake_redis_server.py [--host 127.0.0.1] [--port 6390]
+
+then start the app with CACHE_BACKEND=redis CACHE_REDIS_URL=redis://127.0.0.1:6390/0.
+Everything lives in memory and is lost on exit. EVAL only understands the lock
+release script the cache sends.
+"""
+import argparse
+import os
+import socketserver
+import sys
+import threading
+import time
+from fnmatch import fnmatchcase
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from app.utils.cache import RedisBackend
+
+class Store:
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def live(self, key):
+        # Caller holds the lock
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def remove(self, key):
+        self.expires.pop(key, None)
+        return self.data.pop(key, None) is not None
+
+def command_set(store, key, value, *options):
+    options = [option.upper() for option in options]
+    expires = None
+    if b'PX' in options:
+        expires = time.monotonic() + int(options[options.index(b'PX') + 1]) / 1000
+    if b'EX' in options:
+        expires = time.monotonic() + int(options[options.index(b'EX') + 1])
+
+    if b'NX' in options and store.live(key) is not None:
+        return None
+    store.data[key] = value
+    store.expires.pop(key, None)
+    if expires is not None:
+        store.expires[key] = expires
+    return 'OK'
+
+def command_incrby(store, key, delta):
+    current = store.live(key)
+    try:
+        value = int(current or 0) + int(delta)
+    except ValueError:
+        raise ValueError('ERR value is not an integer or out of range')
+    store.data[key] = str(value).encode()
+    return value
+
+def command_pexpire(store, key, milliseconds):
+    if store.live(key) is None:
+        return 0
+    store.expires[key] = time.monotonic() + int(milliseconds) / 1000
+    return 1
+
+def command_eval(store, script, count, key, token):
+    if script.decode() != RedisBackend.RELEASE_SCRIPT:
+        raise ValueError('ERR only the cache lock release script is supported')
+    if store.live(key) == token:
+        return int(store.remove(key))
+    return 0
+
+def command_scan(store, cursor, *options):
+    pattern = b'*'
+    if b'MATCH' in [option.upper() for option in options]:
+        pattern = options[[option.upper() for option in options].index(b'MATCH') + 1]
+    keys = [key for key in list(store.data) if store.live(key) is not None and fnmatchcase(key, pattern)]
+    return [b'0', keys]
+
+COMMANDS = {
+    b'PING': lambda store: 'PONG',
+    b'SELECT': lambda store, index: 'OK',
+    b'AUTH': lambda store, *credentials: 'OK',
+    b'GET': lambda store, key: store.live(key),
+    b'SET': command_set,
+    b'DEL': lambda store, *keys: sum(store.remove(key) for key in keys),
+    b'INCR': lambda store, key: command_incrby(store, key, 1),
+    b'INCRBY': command_incrby,
+    b'PEXPIRE': command_pexpire,
+    b'EVAL': command_eval,
+    b'SCAN': command_scan,
+    b'FLUSHDB': lambda store: store.data.clear() or store.expires.clear() or 'OK'
+}
+
+def encode(reply):
+    if reply is None:
+        return b'$-1\r\n'
+    if isinstance(reply, str):
+        return b'+%s\r\n' % reply.encode()
+    if isinstance(reply, int):
+        return b':%d\r\n' % reply
+    if isinstance(reply, bytes):
+        return b'$%d\r\n%s\r\n' % (len(reply), reply)
+    return b'*%d\r\n' % len(reply) + b''.join(encode(item) for item in reply)
+
+class Handler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b'*'):
+            # Inline command, as typed into telnet
+            return line.split()
+
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def handle(self):
+        store = self.server.store
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            if not args:
+                continue
+
+            handler = COMMANDS.get(args[0].upper())
+            if handler is None:
+                self.wfile.write(b'-ERR unknown command %s\r\n' % args[0])
+                continue
+
+            try:
+                with store.lock:
+                    reply = handler(store, *args[1:])
+            except TypeError:
+                reply = ValueError(f'ERR wrong number of arguments for {args[0].decode()!r}')
+            except ValueError as error:
+                reply = error
+
+            if isinstance(reply, ValueError):
+                self.wfile.write(b'-%s\r\n' % str(reply).encode())
+            else:
+                self.wfile.write(encode(reply))
+
+class Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address):
+        super().__init__(address, Handler)
+        self.store = Store()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6390)
+    args = parser.parse_args()
+
+    with Server((args.host, args.port)) as server:
+        print(f'Fake Redis listening on {args.host}:{args.port}')
+        server.serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""Drive the hot endpoints of a running backend and report latency percentiles and throughput.
+
+Seed a database (flask seed generate ...), start the app against it, then run
+from the backend directory:
+
+    python scripts/loadtest.py --admin-username ADMIN --admin-password SECRET \\
+        [--base-url http://127.0.0.1:5000] [--duration 30] [--concurrency 16] \\
+        [--output loadtest.json] [--baseline previous.json]
+
+Worker threads pick scenarios by weight until the duration is up. The report
+holds p50/p95/p99, mean and max latency, throughput and status codes per
+scenario, and is written as JSON so two releases can be diffed, or compared
+directly with --baseline.
+"""
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from itertools import accumulate
+from urllib.parse import urlparse
+
+STATS_PATHS = {
+    'stats_admin': '/api/stats/admin',
+    'stats_admin_bookings': '/api/stats/admin/bookings',
+    'stats_admin_tickets': '/api/stats/admin/tickets',
+    'stats_admin_transactions': '/api/stats/admin/transactions',
+    'stats_admin_monthly_sales': '/api/stats/admin/monthly-sales',
+    'stats_admin_top_customers': '/api/stats/admin/top-customers'
+}
+
+class Client:
+    """One keep-alive HTTP connection, reopened whenever the server closes it"""
+
+    def __init__(self, base_url, timeout):
+        parsed = urlparse(base_url)
+        self.connection_class = http.client.HTTPSConnection if parsed.scheme == 'https' else http.client.HTTPConnection
+        self.host = parsed.netloc
+        self.timeout = timeout
+        self.connection = None
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Accept': 'application/json'}
+        if body is not None:
+            body = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+
+        for attempt in (1, 2):
+            if self.connection is None:
+                self.connection = self.connection_class(self.host, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=body, headers=headers)
+                response = self.connection.getresponse()
+                payload = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # A kept-alive connection the server dropped between requests: retry once on a new one
+                self.close()
+                if attempt == 2:
+                    raise
+                continue
+
+            if response.will_close:
+                self.close()
+            try:
+                data = json.loads(payload) if payload else None
+            except ValueError:
+                data = None
+            return response.status, data
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+        self.errors = Counter()
+        self.lock = threading.Lock()
+
+    def record(self, name, elapsed, status):
+        with self.lock:
+            self.latencies.setdefault(name, []).append(elapsed)
+            self.statuses.setdefault(name, Counter())[str(status)] += 1
+            if status is None or status >= 500:
+                self.errors[name] += 1
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    if not ordered:
+        return None
+    index = max(int(round(fraction * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+def summarize(latencies, statuses, errors, elapsed):
+    ordered = sorted(latencies)
+    milliseconds = lambda value: round(value * 1000, 2) if value is not None else None
+    return {
+        'requests': len(ordered),
+        'errors': errors,
+        'throughput_rps': round(len(ordered) / elapsed, 2),
+        'latency_ms': {
+            'p50': milliseconds(percentile(ordered, 0.50)),
+            'p95': milliseconds(percentile(ordered, 0.95)),
+            'p99': milliseconds(percentile(ordered, 0.99)),
+            'mean': milliseconds(sum(ordered) / len(ordered)) if ordered else None,
+            'max': milliseconds(ordered[-1]) if ordered else None
+        },
+        'status': dict(sorted(statuses.items()))
+    }
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.recorder = Recorder()
+        self.lock = threading.Lock()
+        self.admin_token = None
+        self.usernames = []
+        self.destinations = []
+        self.destination_weights = []
+        self.departures = []
+
+    def client(self):
+        return Client(self.args.base_url, self.args.timeout)
+
+    def login(self, client, username, password):
+        status, data = client.request('POST', '/api/auth/login', {'username': username, 'password': password})
+        if status != 200:
+            raise SystemExit(f'Could not log in as {username!r}: {status} {data}')
+        return data['access_token']
+
+    def setup(self):
+        """Log in, and collect the users, destinations and departures the scenarios use"""
+        client = self.client()
+        args = self.args
+
+        if args.admin_username:
+            self.admin_token = self.login(client, args.admin_username, args.admin_password)
+            status, data = client.request('GET', '/api/admin/users?limit=200', token=self.admin_token)
+            if status == 200:
+                self.usernames = [user['username'] for user in data['users'] if user['role'] == 'member']
+        if args.username:
+            self.usernames = [args.username]
+        if not self.usernames:
+            raise SystemExit('No member to log in as: pass --username, or admin credentials to list members')
+
+        _, data = client.request('GET', '/api/admin/destinations/all')
+        self.destinations = sorted(d['id'] for d in data['data'] if d['status'] == 'active')
+        self.destination_weights = list(accumulate(1 / rank for rank in range(1, len(self.destinations) + 1)))
+
+        # Departures to book, from a few searches over the busiest destinations
+        for _ in range(20):
+            search = self.search_body(self.rng)
+            status, data = client.request('POST', '/api/admin/avenues/available', search)
+            if status == 200:
+                for result in data['data']:
+                    if result['seat_availability']['economy'] > 0:
+                        self.departures.append((result['id'], search['date'], result['travel_mode'], result['prices']['economy']))
+        client.close()
+
+    def search_body(self, rng):
+        # Busy origins are searched far more often than the long tail
+        origin = rng.choices(self.destinations, cum_weights=self.destination_weights)[0]
+        journey = date.today() + timedelta(days=rng.choice([1, 2, 3, 7, 14, 30, 60]))
+        return {'from': origin, 'date': journey.isoformat(), 'passenger': rng.choice([1, 1, 2])}
+
+    def scenarios(self):
+        """(name, weight, run(client, state)) for every scenario that can run"""
+        def available(client, state):
+            return client.request('POST', '/api/admin/avenues/available', self.search_body(state['rng']))
+
+        def login(client, state):
+            return client.request('POST', '/api/auth/login', {
+                'username': state['rng'].choice(self.usernames), 'password': self.args.password
+            })
+
+        def user_bookings(client, state):
+            return client.request('GET', '/api/bookings/user?limit=50', token=state['token'])
+
+        def create_booking(client, state):
+            avenue_id, journey, mode, price = state['rng'].choice(self.departures)
+            return client.request('POST', '/api/bookings/create', {
+                'avenue_id': avenue_id, 'date': journey, 'mode': mode, 'type': 'economy',
+                'seat': 1, 'price': price, 'payment': 'stripe'
+            }, token=state['token'])
+
+        scenarios = [
+            ('avenues_available', 40, available),
+            ('auth_login', 5, login),
+            ('bookings_user', 20, user_bookings)
+        ]
+        if self.departures:
+            scenarios.append(('bookings_create', 10, create_booking))
+        if self.admin_token:
+            for name, path in STATS_PATHS.items():
+                scenarios.append((name, 2, lambda client, state, path=path: client.request('GET', path, token=self.admin_token)))
+
+        if self.args.scenarios:
+            wanted = set(self.args.scenarios.split(','))
+            scenarios = [scenario for scenario in scenarios if scenario[0] in wanted]
+        return scenarios
+
+    def worker(self, scenarios, deadline):
+        # Each thread has its own generator so runs with the same seed pick the same mix
+        with self.lock:
+            rng = random.Random(self.rng.random())
+        client = self.client()
+        state = {'rng': rng, 'token': self.login(client, rng.choice(self.usernames), self.args.password)}
+        names = [scenario[0] for scenario in scenarios]
+        weights = [scenario[1] for scenario in scenarios]
+        runs = {scenario[0]: scenario[2] for scenario in scenarios}
+
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights=weights)[0]
+            started = time.perf_counter()
+            try:
+                status, _ = runs[name](client, state)
+            except (OSError, http.client.HTTPException):
+                client.close()
+                status = None
+            self.recorder.record(name, time.perf_counter() - started, status)
+        client.close()
+
+    def run(self):
+        self.setup()
+        scenarios = self.scenarios()
+        if not scenarios:
+            raise SystemExit('No scenario left to run')
+
+        started_at = datetime.now(timezone.utc)
+        started = time.monotonic()
+        deadline = started + self.args.duration
+        threads = [
+            threading.Thread(target=self.worker, args=(scenarios, deadline), daemon=True)
+            for _ in range(self.args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        recorder = self.recorder
+        all_latencies = [value for values in recorder.latencies.values() for value in values]
+        all_statuses = sum(recorder.statuses.values(), Counter())
+        return {
+            'meta': {
+                'base_url': self.args.base_url,
+                'started_at': started_at.isoformat(),
+                'duration_s': round(elapsed, 2),
+                'concurrency': self.args.concurrency,
+                'seed': self.args.seed
+            },
+            'scenarios': {
+                name: summarize(recorder.latencies[name], recorder.statuses[name], recorder.errors[name], elapsed)
+                for name in sorted(recorder.latencies)
+            },
+            'total': summarize(all_latencies, all_statuses, sum(recorder.errors.values()), elapsed)
+        }
+
+def compare(report, baseline):
+    """Print the change of each scenario's percentiles and throughput against a previous report"""
+    def change(new, old):
+        if new is None or not old:
+            return '    n/a'
+        return f'{(new - old) / old * 100:+6.1f}%'
+
+    print(f"{'scenario':28} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8}")
+    rows = dict(report['scenarios'], total=report['total'])
+    old_rows = dict(baseline.get('scenarios', {}), total=baseline.get('total', {}))
+    for name, row in rows.items():
+        old = old_rows.get(name)
+        if not old:
+            continue
+        latency, old_latency = row['latency_ms'], old['latency_ms']
+        print(f"{name:28} {change(latency['p50'], old_latency['p50']):>8} {change(latency['p95'], old_latency['p95']):>8} "
+              f"{change(latency['p99'], old_latency['p99']):>8} {change(row['throughput_rps'], old['throughput_rps']):>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--base-url', default='http://127.0.0.1:5000')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run for')
+    parser.add_argument('--concurrency', type=int, default=16, help='Simultaneous clients')
+    parser.add_argument('--admin-username', help='Admin login, for the stats scenarios and the member list')
+    parser.add_argument('--admin-password')
+    parser.add_argument('--username', help='Member to run as, instead of members listed through the admin API')
+    parser.add_argument('--password', default='password123', help='Password of the members (the seed default)')
+    parser.add_argument('--scenarios', help='Comma-separated scenario names to run, default all')
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='loadtest.json')
+    parser.add_argument('--baseline', help='Earlier report to compare against')
+    args = parser.parse_args()
+
+    report = LoadTest(args).run()
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, row in dict(report['scenarios'], total=report['total']).items():
+        latency = row['latency_ms']
+        print(f"{name:28} {row['requests']:>7} req {row['throughput_rps']:>8} rps  "
+              f"p50 {latency['p50']} ms  p95 {latency['p95']} ms  p99 {latency['p99']} ms  errors {row['errors']}")
+    print(f'Wrote {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,21 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+@pytest.fixture(scope='module')
+def app(tmp_path_factory):
+    """The app on a file-backed copy of the bundled database, so threads share real connections"""
+    path = tmp_path_factory.mktemp('db') / 'app.db'
+    shutil.copy(os.path.join(BACKEND, 'instance', 'app.db'), path)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    os.environ['PASSWORD_HASH_WORKERS'] = '0'
+
+    from app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    yield app
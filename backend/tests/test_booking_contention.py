@@ -0,0 +1,64 @@
+import threading
+from datetime import date, timedelta
+
+from app import db
+from app.models import Avenue, Booking, SeatClass, SeatInventory, Transaction, TransactionType, TravelMode, User, UserRole
+from app.services.booking_service import create_booking
+from app.services.inventory_service import get_class_capacity
+
+BUYERS = 12
+SEATS_LEFT = 3
+
+def test_concurrent_buyers_never_oversell(app):
+    journey = date.today() + timedelta(days=300)
+    mode, seat_class = TravelMode.COACH, SeatClass.ECONOMY
+    capacity = get_class_capacity(mode, seat_class)
+
+    with app.app_context():
+        avenue = Avenue.query.first()
+        user_id = User.query.filter_by(role=UserRole.MEMBER).first().id
+        avenue_id, price = avenue.id, avenue.price
+        # Only the last few seats of the departure are left
+        db.session.add(SeatInventory(
+            avenue_id=avenue_id, date=journey, mode=mode, type=seat_class,
+            capacity=capacity, booked=capacity - SEATS_LEFT
+        ))
+        db.session.commit()
+
+    barrier = threading.Barrier(BUYERS)
+    results = []
+    lock = threading.Lock()
+
+    def buy():
+        barrier.wait()
+        # A request context, so the transaction starts the way the create endpoint's does
+        with app.test_request_context('/api/bookings/create', method='POST'):
+            booking, error = create_booking({
+                'avenue_id': avenue_id, 'user_id': user_id, 'date': journey.isoformat(),
+                'mode': mode.value, 'type': seat_class.value, 'seat': 1, 'price': price, 'payment': 'stripe'
+            })
+            with lock:
+                results.append((booking.id if booking else None, error))
+
+    threads = [threading.Thread(target=buy) for _ in range(BUYERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    sold = [booking_id for booking_id, _ in results if booking_id]
+    errors = {error for _, error in results if error}
+    assert len(results) == BUYERS
+    assert len(sold) == SEATS_LEFT
+    assert errors == {'Not enough seats available for this departure'}
+
+    with app.app_context():
+        inventory = db.session.get(SeatInventory, (avenue_id, journey, mode, seat_class))
+        assert inventory.booked <= inventory.capacity
+        assert inventory.booked - (capacity - SEATS_LEFT) == len(sold)
+
+        bookings = Booking.query.filter_by(avenue_id=avenue_id, date=journey, mode=mode, type=seat_class).all()
+        assert sorted(booking.id for booking in bookings) == sorted(sold)
+        for booking in bookings:
+            payments = Transaction.query.filter_by(booking_id=booking.id, type=TransactionType.PAYMENT).count()
+            assert payments == 1
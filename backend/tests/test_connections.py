@@ -0,0 +1,20 @@
+import pytest
+
+URL = '/api/admin/avenues/connections'
+
+@pytest.mark.parametrize('body', [
+    {'data': ''},
+    {'data': 'null', 'content_type': 'application/json'},
+    {'json': [1, 2]}
+])
+def test_connections_rejects_a_body_that_is_not_an_object(app, body):
+    response = app.test_client().post(URL, **body)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'error': 'Request body must be a JSON object'}
+
+def test_connections_requires_a_date(app):
+    response = app.test_client().post(URL, json={})
+
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Journey date is required'
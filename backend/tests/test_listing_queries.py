@@ -0,0 +1,72 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import Avenue, User
+from app.services.booking_service import create_booking
+from app.utils.security import create_access_token_for_user
+
+ADMIN_ENDPOINTS = ('/api/bookings/all', '/api/transactions/all', '/api/admin/avenues/all')
+MAX_QUERIES = 5
+
+@pytest.fixture(scope='module')
+def member(app):
+    with app.app_context():
+        user = User(username='listing-member', email='listing-member@example.com')
+        user.set_password('listing-password')
+        db.session.add(user)
+        db.session.commit()
+        return user.id, create_access_token_for_user(user)
+
+@pytest.fixture(scope='module')
+def admin_token(app):
+    with app.app_context():
+        return create_access_token_for_user(User.query.filter_by(username='nben').one())
+
+def book(app, user_id, count):
+    with app.app_context():
+        avenues = Avenue.query.all()
+        for i in range(count):
+            avenue = avenues[i % len(avenues)]
+            _, error = create_booking({
+                'avenue_id': avenue.id, 'user_id': user_id,
+                'date': (date.today() + timedelta(days=30 + i)).isoformat(),
+                'mode': 'coach', 'type': 'economy', 'seat': 1, 'price': avenue.price, 'payment': 'stripe'
+            })
+            assert error is None
+
+def count_queries(app, client, url, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    # Warm up first, so the current user is cached like on any steady-state request
+    assert client.get(url, headers=headers).status_code == 200
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 200
+    return len(statements)
+
+def test_listing_queries_do_not_grow_with_rows(app, member, admin_token):
+    client = app.test_client()
+    user_id, member_token = member
+
+    book(app, user_id, 1)
+    one = {url: count_queries(app, client, f'{url}?limit=1', admin_token) for url in ADMIN_ENDPOINTS}
+    one['/api/bookings/user'] = count_queries(app, client, '/api/bookings/user', member_token)
+
+    book(app, user_id, 20)
+    many = {url: count_queries(app, client, f'{url}?limit=100', admin_token) for url in ADMIN_ENDPOINTS}
+    many['/api/bookings/user'] = count_queries(app, client, '/api/bookings/user', member_token)
+
+    assert many == one
+    assert max(one.values()) <= MAX_QUERIES